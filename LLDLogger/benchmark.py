@@ -0,0 +1,89 @@
+import functools
+import multiprocessing
+import os
+import tempfile
+import time
+
+from LLDLogger.logCollector import LogCollector
+from LLDLogger.logging import (AsyncQueueAppender, BackpressurePolicy, FileAppender, JsonFormatter, LogLevel,
+                               LogMessage, RotatingFileAppender)
+
+
+# -----------------------------
+# FileAppender vs. AsyncQueueAppender
+# -----------------------------
+def _measure(appender, messages):
+    latencies = []
+    start = time.perf_counter()
+    for message in messages:
+        t0 = time.perf_counter_ns()
+        appender.append(message)
+        latencies.append(time.perf_counter_ns() - t0)
+    caller_elapsed = time.perf_counter() - start
+    latencies.sort()
+    return caller_elapsed, latencies[int(len(latencies) * 0.99)]
+
+
+def _messages(count):
+    # Fresh messages per run: LogMessage memoizes its formatted output, so a
+    # reused list would let later appenders skip formatting entirely.
+    return [LogMessage(LogLevel.ERROR, "request %d failed: upstream timeout", (i,)) for i in range(count)]
+
+
+def bench_appenders(count=50_000):
+    print(f"{'appender':>26} {'msgs/sec':>12} {'caller msgs/sec':>16} {'p99 us':>10} {'dropped':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sync.txt")
+        elapsed, p99 = _measure(FileAppender(JsonFormatter(), path), _messages(count))
+        print(f"{'FileAppender':>26} {count / elapsed:>12,.0f} {count / elapsed:>16,.0f} {p99 / 1000:>10.1f} {0:>8}")
+
+        for policy in BackpressurePolicy:
+            path = os.path.join(directory, f"{policy.name}.txt")
+            appender = AsyncQueueAppender(JsonFormatter(), path, capacity=4096, policy=policy)
+            messages = _messages(count)
+            start = time.perf_counter()
+            caller_elapsed, p99 = _measure(appender, messages)
+            appender.close()
+            total = time.perf_counter() - start
+            name = f"Async({policy.name})"
+            print(f"{name:>26} {count / total:>12,.0f} {count / caller_elapsed:>16,.0f} "
+                  f"{p99 / 1000:>10.1f} {appender.dropped:>8}")
+
+
+# -----------------------------
+# Producers -> LogCollector process
+# -----------------------------
+def _collector_appenders(path):
+    return [RotatingFileAppender(JsonFormatter(), path, max_bytes=1 << 40, compression=None)]
+
+
+def _produce(forwarder, count):
+    for i in range(count):
+        forwarder.append(LogMessage(LogLevel.ERROR, "request %d failed: upstream timeout", (i,)))
+    forwarder.close()
+
+
+def bench_collector(producer_counts=(1, 4, 16), messages_per_producer=20_000):
+    print(f"{'producers':>10} {'messages':>10} {'msgs/sec':>12}")
+    for producers in producer_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "collected.txt")
+            collector = LogCollector(functools.partial(_collector_appenders, path))
+            forwarder = collector.appender()
+            workers = [multiprocessing.Process(target=_produce, args=(forwarder, messages_per_producer))
+                       for _ in range(producers)]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            collector.stop()
+            elapsed = time.perf_counter() - start
+            with open(path) as f:
+                written = sum(1 for _ in f)
+            print(f"{producers:>10} {written:>10} {written / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    bench_appenders()
+    bench_collector()
@@ -0,0 +1,245 @@
+import argparse
+import os
+import struct
+import sys
+import threading
+from typing import Iterable, Iterator, List, Optional
+
+from LLDLogger.logging import JsonFormatter, LogAppender, LogFormatter, LogLevel, LogMessage, PlainTextFormatter
+
+# Data file:  MAGIC, then records back to back.
+#   record = varint(len(body)) + body
+#   body   = level byte (LogLevel.value) + varint(timestamp ms) + utf-8 message
+#
+# Index file (<data>.idx): one fixed-size entry per sealed block of records:
+#   start offset, end offset, min timestamp, max timestamp, bitmask of levels present
+# Readers use it to skip whole blocks by time range or level; records after the
+# last sealed block (not yet indexed) are scanned directly.
+MAGIC = b"LLDLOG1\n"
+_INDEX_ENTRY = struct.Struct("<QQQQB")
+_LEVELS = {level.value: level for level in LogLevel}
+
+
+def encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varint(data, offset: int):
+    result = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+# -----------------------------
+# Formatter / Appender
+# -----------------------------
+class BinaryFormatter(LogFormatter):
+    def format(self, log_message: LogMessage) -> bytes:
+        body = (bytes((log_message.level.value,)) + encode_varint(log_message.timestamp)
+                + log_message.message.encode())
+        return encode_varint(len(body)) + body
+
+
+class BinaryFileAppender(LogAppender):
+    # Appends BinaryFormatter records to file_name and seals a block into the
+    # index every block_size bytes (and on close). Reopening a file indexes the
+    # records a previous writer left after its last sealed block (it may have
+    # exited without close()) and cuts off a torn record at the end.
+    def __init__(self, file_name: str, block_size: int = 64 * 1024, formatter: LogFormatter = None):
+        super().__init__(formatter or BinaryFormatter())
+        self.file_name = file_name
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._file = open(file_name, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._index = open(file_name + ".idx", "ab")
+        self._seal_unindexed_tail()
+        self._start_block(self._file.tell())
+
+    def _seal_unindexed_tail(self):
+        index_size = self._index.tell()
+        if index_size % _INDEX_ENTRY.size:  # torn index entry
+            self._index.truncate(index_size - index_size % _INDEX_ENTRY.size)
+            self._index.seek(0, os.SEEK_END)
+        blocks = BinaryLogReader(self.file_name).blocks
+        start = blocks[-1][1] if blocks else len(MAGIC)
+        with open(self.file_name, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        offset = 0
+        self._start_block(start)
+        while offset < len(data):
+            try:
+                length, body = decode_varint(data, offset)
+                if not length or body + length > len(data):
+                    break
+                ts, _ = decode_varint(data, body + 1)
+            except IndexError:
+                break
+            if self._min_ts is None or ts < self._min_ts:
+                self._min_ts = ts
+            if self._max_ts is None or ts > self._max_ts:
+                self._max_ts = ts
+            self._level_mask |= 1 << data[body]
+            offset = body + length
+        if offset < len(data):
+            self._file.truncate(start + offset)
+            self._file.seek(0, os.SEEK_END)
+        self._seal_block()
+
+    def _start_block(self, offset: int):
+        self._block_start = offset
+        self._min_ts = None
+        self._max_ts = None
+        self._level_mask = 0
+
+    def _seal_block(self):
+        end = self._file.tell()
+        if end > self._block_start:
+            self._file.flush()
+            self._index.write(_INDEX_ENTRY.pack(self._block_start, end, self._min_ts, self._max_ts,
+                                                self._level_mask))
+            self._index.flush()
+        self._start_block(end)
+
+    def append(self, log_message: LogMessage):
+        record = log_message.formatted(self.formatter)
+        ts = log_message.timestamp
+        with self._lock:
+            self._file.write(record)
+            if self._min_ts is None or ts < self._min_ts:
+                self._min_ts = ts
+            if self._max_ts is None or ts > self._max_ts:
+                self._max_ts = ts
+            self._level_mask |= 1 << log_message.level.value
+            if self._file.tell() - self._block_start >= self.block_size:
+                self._seal_block()
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._seal_block()
+            self._file.close()
+            self._index.close()
+
+
+# -----------------------------
+# Reader
+# -----------------------------
+class BinaryLogReader:
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.blocks = []
+        index_name = file_name + ".idx"
+        if os.path.exists(index_name):
+            with open(index_name, "rb") as f:
+                data = f.read()
+            usable = len(data) - len(data) % _INDEX_ENTRY.size
+            self.blocks = [_INDEX_ENTRY.unpack_from(data, i) for i in range(0, usable, _INDEX_ENTRY.size)]
+
+    def _block_ranges(self, start: Optional[int], end: Optional[int], level_mask: int):
+        for first, last, min_ts, max_ts, mask in self.blocks:
+            if start is not None and max_ts < start:
+                continue
+            if end is not None and min_ts > end:
+                continue
+            if not mask & level_mask:
+                continue
+            yield first, last
+        tail_start = self.blocks[-1][1] if self.blocks else len(MAGIC)
+        yield tail_start, None
+
+    def records(self, start: Optional[int] = None, end: Optional[int] = None,
+                levels: Optional[Iterable[LogLevel]] = None) -> Iterator[LogMessage]:
+        # start/end are inclusive millisecond timestamps.
+        wanted = {level.value for level in levels} if levels else set(_LEVELS)
+        level_mask = sum(1 << value for value in wanted)
+        with open(self.file_name, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.file_name} is not a binary log")
+            for first, last in self._block_ranges(start, end, level_mask):
+                f.seek(first)
+                data = f.read() if last is None else f.read(last - first)
+                yield from self._parse(data, start, end, wanted)
+
+    @staticmethod
+    def _parse(data: bytes, start, end, wanted) -> Iterator[LogMessage]:
+        offset, size = 0, len(data)
+        while offset < size:
+            try:
+                length, body = decode_varint(data, offset)
+            except IndexError:
+                return  # torn record at the end of the file
+            offset = body + length
+            if offset > size:
+                return
+            level = data[body]
+            if level not in wanted:
+                continue
+            ts, text = decode_varint(data, body + 1)
+            if (start is not None and ts < start) or (end is not None and ts > end):
+                continue
+            yield LogMessage(_LEVELS[level], data[text:offset].decode(), timestamp=ts)
+
+    def tail(self, count: int, levels: Optional[Iterable[LogLevel]] = None,
+             start: Optional[int] = None, end: Optional[int] = None) -> List[LogMessage]:
+        # Last `count` matching records, reading blocks backwards from the end of the file.
+        wanted = {level.value for level in levels} if levels else set(_LEVELS)
+        level_mask = sum(1 << value for value in wanted)
+        ranges = list(self._block_ranges(start, end, level_mask))
+        found: List[LogMessage] = []
+        with open(self.file_name, "rb") as f:
+            for first, last in reversed(ranges):
+                f.seek(first)
+                data = f.read() if last is None else f.read(last - first)
+                found = list(self._parse(data, start, end, wanted)) + found
+                if len(found) >= count:
+                    break
+        return found[-count:] if count else []
+
+    def convert(self, out, formatter: LogFormatter = None, **filters) -> int:
+        # Stream matching records to a text stream using a text formatter.
+        formatter = formatter or PlainTextFormatter()
+        written = 0
+        for log_message in self.records(**filters):
+            out.write(formatter.format(log_message) + "\n")
+            written += 1
+        return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or tail an LLDLogger binary log")
+    parser.add_argument("file")
+    parser.add_argument("--since", type=int, help="first timestamp (ms, inclusive)")
+    parser.add_argument("--until", type=int, help="last timestamp (ms, inclusive)")
+    parser.add_argument("--level", action="append", choices=[level.name for level in LogLevel])
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--tail", type=int, help="only print the last N matching records")
+    args = parser.parse_args(argv)
+
+    reader = BinaryLogReader(args.file)
+    levels = [LogLevel[name] for name in args.level] if args.level else None
+    formatter = JsonFormatter() if args.format == "json" else PlainTextFormatter()
+    if args.tail is not None:
+        for log_message in reader.tail(args.tail, levels, start=args.since, end=args.until):
+            sys.stdout.write(formatter.format(log_message) + "\n")
+    else:
+        reader.convert(sys.stdout, formatter, start=args.since, end=args.until, levels=levels)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import threading
+import time
+import weakref
+from typing import Callable, List
+
+from LLDLogger.logging import LogAppender, LogLevel, LogMessage, PlainTextFormatter, RotatingFileAppender
+
+_LEVELS = {level.value: level for level in LogLevel}
+
+
+# -----------------------------
+# Producer side
+# -----------------------------
+class QueueForwardingAppender(LogAppender):
+    # Ships messages to a LogCollector instead of writing them. Messages are
+    # reduced to (level, timestamp, message) tuples and sent in batches of
+    # batch_size; a background thread sends a partial batch once it is
+    # flush_interval old, and whatever is left is flushed at process exit.
+    # Can be passed to children under spawn or inherited across fork (plain
+    # os.fork() included): each process gets its own lock, batch and flush
+    # thread, and a forked child drops the parent's unsent batch.
+    def __init__(self, queue, batch_size: int = 256, flush_interval: float = 0.2):
+        super().__init__(None)
+        self.queue = queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._start()
+        _forwarders.add(self)
+
+    def _start(self):
+        finalizer = getattr(self, "_finalizer", None)
+        if finalizer is not None:  # inherited from the parent process
+            finalizer.cancel()
+        self._lock = threading.Lock()
+        self._batch = []
+        self._last_send = time.monotonic()
+        self._stop = None
+        # Runs before the queue's own exit finalizer (priority 10) closes its feeder thread.
+        self._finalizer = multiprocessing.util.Finalize(self, self.flush, exitpriority=20)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ("_lock", "_batch", "_last_send", "_stop", "_finalizer"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._start()
+        _forwarders.add(self)
+        # Unpickled in a spawned child before multiprocessing clears the
+        # finalizer registry; register the exit flush again after that.
+        multiprocessing.util.register_after_fork(self, QueueForwardingAppender._start)
+
+    def _after_fork(self):
+        # A plain os.fork() skips multiprocessing's own after-fork hooks, so
+        # reset the queue's feeder thread here too (harmless when they run).
+        after_fork = getattr(self.queue, "_after_fork", None)
+        if after_fork is not None:
+            after_fork()
+        self._start()
+        # multiprocessing children clear the finalizer registry after this
+        # hook runs; register the exit flush again once they have.
+        multiprocessing.util.register_after_fork(self, QueueForwardingAppender._start)
+
+    def append(self, log_message: LogMessage):
+        with self._lock:
+            self._batch.append((log_message.level.value, log_message.timestamp, log_message.message))
+            if len(self._batch) >= self.batch_size:
+                self._send()
+            elif self._stop is None:
+                self._stop = threading.Event()
+                threading.Thread(target=self._flush_loop, args=(self._stop,), name="log-forwarder",
+                                 daemon=True).start()
+
+    def _flush_loop(self, stop: threading.Event):
+        while not stop.wait(self.flush_interval):
+            with self._lock:
+                if self._batch and time.monotonic() - self._last_send >= self.flush_interval:
+                    self._send()
+
+    def _send(self):
+        if self._batch:
+            self.queue.put(self._batch)
+            self._batch = []
+        self._last_send = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._send()
+
+    def close(self):
+        with self._lock:
+            self._send()
+            if self._stop is not None:
+                self._stop.set()
+                self._stop = None
+
+
+_forwarders = weakref.WeakSet()
+
+
+def _reset_forwarders_after_fork():
+    # Runs in every forked child before any other thread exists there.
+    for forwarder in list(_forwarders):
+        forwarder._after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_forwarders_after_fork)
+
+
+# -----------------------------
+# Collector process
+# -----------------------------
+def _collect(queue, appender_factory: Callable[[], List[LogAppender]]):
+    appenders = appender_factory()
+    try:
+        while True:
+            batch = queue.get()
+            if batch is None:
+                break
+            for level, timestamp, message in batch:
+                log_message = LogMessage(_LEVELS[level], message, timestamp=timestamp)
+                for appender in appenders:
+                    # One failing appender must not kill the collector: producers
+                    # would then block forever on the full queue.
+                    try:
+                        appender.append(log_message)
+                    except Exception as error:
+                        print(f"LogCollector: {type(appender).__name__}: {type(error).__name__}: {error}",
+                              file=sys.stderr)
+    finally:
+        for appender in appenders:
+            close = getattr(appender, "close", None)
+            if close:
+                close()
+
+
+class LogCollector:
+    # Single process that owns the real appenders. appender_factory runs inside
+    # that process and must be picklable (a module-level function), so file
+    # handles are only ever opened there and lines from different producers
+    # never interleave mid-write.
+    def __init__(self, appender_factory: Callable[[], List[LogAppender]], maxsize: int = 1024):
+        self.queue = multiprocessing.Queue(maxsize)
+        self.process = multiprocessing.Process(target=_collect, args=(self.queue, appender_factory),
+                                               name="log-collector", daemon=True)
+        self.process.start()
+
+    def appender(self, **kwargs) -> QueueForwardingAppender:
+        return QueueForwardingAppender(self.queue, **kwargs)
+
+    def stop(self):
+        self.queue.put(None)
+        self.process.join()
+
+
+def _file_appenders():
+    return [RotatingFileAppender(PlainTextFormatter(), "logs.txt", compression=None)]
+
+
+def _worker(appender: QueueForwardingAppender, worker_id: int):
+    for i in range(3):
+        appender.append(LogMessage(LogLevel.ERROR, f"worker {worker_id} message {i}"))
+    appender.close()
+
+
+if __name__ == "__main__":
+    collector = LogCollector(_file_appenders)
+    forwarder = collector.appender()
+    workers = [multiprocessing.Process(target=_worker, args=(forwarder, n)) for n in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    collector.stop()
@@ -1,8 +1,25 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from enum import Enum
+import glob
+import gzip
+import mmap
+import os
+import queue
+import random
+import shutil
+import sys
+import threading
 import time
 import json
 
+from LRUCache.lru import LRUCache
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for compression="zstd"
+    zstandard = None
+
 
 # -----------------------------
 # Log Levels
@@ -19,16 +36,57 @@ class LogLevel(Enum):
 # Log Message
 # -----------------------------
 class LogMessage:
-    def __init__(self, level: LogLevel, message: str):
+    # `message` may be a %-style template; it is rendered with `args` only when
+    # first read, so messages nobody emits never pay for formatting. As in the
+    # stdlib, a single non-empty mapping argument is used for %(name)s lookups,
+    # and a template that fails to render is reported on stderr and emitted
+    # with its arguments instead of raising in the appender. Output per
+    # formatter is memoized, so appenders sharing a formatter type render once.
+    def __init__(self, level: LogLevel, message: str, args: tuple = (), timestamp: int = None):
         self.level = level
-        self.message = message
-        self.timestamp = int(time.time() * 1000)  # milliseconds
+        self.template = message  # unrendered message, stable across args
+        if len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            args = args[0]
+        self.args = args
+        self.timestamp = timestamp if timestamp is not None else int(time.time() * 1000)  # milliseconds
+        self._message = None if args else message
+        self._rendered = None
+
+    @property
+    def message(self) -> str:
+        # Rendering only reads template/args, so concurrent first reads at worst
+        # render twice; they never apply % to an already rendered string.
+        message = self._message
+        if message is None:
+            try:
+                message = str(self.template) % self.args
+            except Exception as error:
+                print(f"LogMessage: cannot render {self.template!r} with {self.args!r}: {error}", file=sys.stderr)
+                message = f"{self.template} {self.args!r}"
+            self._message = message
+        return message
+
+    def formatted(self, formatter: 'LogFormatter') -> str:
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = {}
+        key = formatter.cache_key
+        text = rendered.get(key)
+        if text is None:
+            text = rendered[key] = formatter.format(self)
+        return text
 
 
 # -----------------------------
 # Log Formatter
 # -----------------------------
 class LogFormatter(ABC):
+    @property
+    def cache_key(self):
+        # Formatters of the same class render a message identically; configurable
+        # formatters should include their settings here.
+        return type(self)
+
     @abstractmethod
     def format(self, log_message: LogMessage) -> str:
         pass
@@ -48,6 +106,23 @@ class JsonFormatter(LogFormatter):
         })
 
 
+class FastJsonFormatter(LogFormatter):
+    # Same output as JsonFormatter, assembled from pre-encoded fragments: only
+    # the timestamp and the escaped message are built per record.
+    _PREFIX = {level: '{"level": ' + json.dumps(level.name) + ', "timestamp": ' for level in LogLevel}
+    _encode = staticmethod(json.encoder.encode_basestring_ascii)
+
+    @property
+    def cache_key(self):
+        return JsonFormatter
+
+    def format(self, log_message: LogMessage) -> str:
+        message = log_message.message
+        # Non-str messages (logger.error(42)) go through json.dumps, as in JsonFormatter.
+        encoded = self._encode(message) if isinstance(message, str) else json.dumps(message)
+        return self._PREFIX[log_message.level] + str(log_message.timestamp) + ', "message": ' + encoded + "}"
+
+
 # -----------------------------
 # Log Appenders
 # -----------------------------
@@ -62,7 +137,7 @@ class LogAppender(ABC):
 
 class ConsoleAppender(LogAppender):
     def append(self, log_message: LogMessage):
-        print(self.formatter.format(log_message))
+        print(log_message.formatted(self.formatter))
 
 
 class FileAppender(LogAppender):
@@ -72,7 +147,313 @@ class FileAppender(LogAppender):
 
     def append(self, log_message: LogMessage):
         with open(self.file_name, "a") as f:
-            f.write(self.formatter.format(log_message) + "\n")
+            f.write(log_message.formatted(self.formatter) + "\n")
+
+
+class RotatingFileAppender(LogAppender):
+    # Appends to file_name and rotates it when it would exceed max_bytes or when
+    # rotate_interval seconds have passed since it was opened. Rotated segments
+    # are renamed to file_name.<timestamp>.<seq> and compressed ("gzip" or
+    # "zstd") on a background thread, so the logging thread only pays for a
+    # rename. At most backup_count finished segments are kept; segments still
+    # waiting for compression are never deleted by retention.
+    #
+    # use_mmap=True writes through a preallocated memory map (grown in
+    # mmap_chunk steps) instead of a write() call per message; the unused tail
+    # is truncated away on rotation and close, and a zero tail left behind by
+    # a process that never closed the file is trimmed when it is reopened.
+    def __init__(self, formatter: LogFormatter, file_name: str, max_bytes: int = 10 * 1024 * 1024,
+                 rotate_interval: float = None, backup_count: int = 5, compression: str = "gzip",
+                 use_mmap: bool = False, mmap_chunk: int = 1024 * 1024):
+        super().__init__(formatter)
+        if compression not in (None, "gzip", "zstd"):
+            raise ValueError("compression must be None, 'gzip' or 'zstd'")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("compression='zstd' requires the zstandard package")
+        self.file_name = file_name
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compression = compression
+        self.use_mmap = use_mmap
+        self.mmap_chunk = mmap_chunk
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._jobs = queue.Queue()
+        self._pending = set()  # rotated segments queued or being compressed
+        self._compressor = threading.Thread(target=self._compress_loop, name="log-compressor", daemon=True)
+        self._compressor.start()
+        self._open()
+
+    # ---- file handling ----
+    def _open(self):
+        _trim_zero_tail(self.file_name)
+        self._file = open(self.file_name, "ab" if not self.use_mmap else "a+b")
+        self._size = self._file.seek(0, os.SEEK_END)
+        self._mmap = None
+        if self.use_mmap:
+            self._map(self._size + self.mmap_chunk)
+        self._rollover_at = time.time() + self.rotate_interval if self.rotate_interval else None
+
+    def _map(self, length: int):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.truncate(length)
+        self._mmap = mmap.mmap(self._file.fileno(), length)
+
+    def _close_file(self):
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+            self._file.truncate(self._size)
+        self._file.close()
+
+    def _rotate(self):
+        self._close_file()
+        if self._size:
+            self._seq += 1
+            rotated = f"{self.file_name}.{time.strftime('%Y%m%d%H%M%S')}.{self._seq:06d}"
+            os.replace(self.file_name, rotated)
+            self._pending.add(rotated)
+            self._jobs.put(rotated)
+        self._open()
+
+    # ---- appending ----
+    def append(self, log_message: LogMessage):
+        data = (log_message.formatted(self.formatter) + "\n").encode()
+        with self._lock:
+            if self._size and (self._size + len(data) > self.max_bytes
+                               or (self._rollover_at and log_message.timestamp / 1000 >= self._rollover_at)):
+                self._rotate()
+            if self._mmap is not None:
+                end = self._size + len(data)
+                if end > len(self._mmap):
+                    self._map(max(end, len(self._mmap) + self.mmap_chunk))
+                self._mmap[self._size:end] = data
+            else:
+                self._file.write(data)
+                self._file.flush()
+            self._size += len(data)
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+        self._jobs.put(None)
+        self._compressor.join()
+
+    # ---- background compression and retention ----
+    def _compress_loop(self):
+        while True:
+            path = self._jobs.get()
+            if path is None:
+                return
+            try:
+                self._compress(path)
+            except Exception as error:
+                print(f"RotatingFileAppender({self.file_name}): compressing {path}: {error}", file=sys.stderr)
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+            try:
+                self._enforce_retention()
+            except Exception as error:
+                print(f"RotatingFileAppender({self.file_name}): retention: {error}", file=sys.stderr)
+
+    def _compress(self, path: str):
+        if self.compression == "gzip":
+            with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+        elif self.compression == "zstd":
+            with open(path, "rb") as src, open(path + ".zst", "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+            os.remove(path)
+
+    def _enforce_retention(self):
+        with self._lock:
+            busy = {name for path in self._pending for name in (path, path + ".gz", path + ".zst")}
+        segments = sorted(path for path in glob.glob(glob.escape(self.file_name) + ".*") if path not in busy)
+        for path in segments[:max(0, len(segments) - self.backup_count)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _trim_zero_tail(path: str, chunk: int = 64 * 1024):
+    # Log lines end in "\n", so trailing NUL bytes can only be unused mmap space.
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return
+    with f:
+        size = end = f.seek(0, os.SEEK_END)
+        while end:
+            start = max(0, end - chunk)
+            f.seek(start)
+            kept = len(f.read(end - start).rstrip(b"\0"))
+            end = start + kept
+            if kept:
+                break
+        if end != size:
+            f.truncate(end)
+
+
+class BackpressurePolicy(Enum):
+    BLOCK = 1
+    DROP_OLDEST = 2
+    DROP_NEWEST = 3
+
+
+class AsyncQueueAppender(LogAppender):
+    # Callers only enqueue into a bounded ring buffer; a background thread
+    # drains it in batches into a file it keeps open, flushing once
+    # flush_bytes have been written or flush_interval seconds have passed.
+    # When the buffer is full the policy decides: BLOCK the caller, overwrite
+    # the oldest queued message, or discard the new one. Dropped messages are
+    # counted and reported in the log as a WARN line. A message that fails to
+    # format or write is reported on stderr and skipped; if the writer thread
+    # stops anyway, append() raises instead of waiting on it.
+    def __init__(self, formatter: LogFormatter, file_name: str, capacity: int = 8192, batch_size: int = 256,
+                 flush_interval: float = 0.5, flush_bytes: int = 64 * 1024,
+                 policy: BackpressurePolicy = BackpressurePolicy.BLOCK):
+        super().__init__(formatter)
+        self.file_name = file_name
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.policy = policy
+        self.buffer = [None] * capacity
+        self.head = 0
+        self.size = 0
+        self.dropped = 0
+        self._reported_drops = 0
+        self._flush_requested = False
+        self._closed = False
+        self._stopped = False
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._worker = threading.Thread(target=self._drain, name="async-log-appender", daemon=True)
+        self._worker.start()
+
+    def append(self, log_message: LogMessage):
+        with self._lock:
+            if self._closed:
+                raise Exception("Appender is closed")
+            if self._stopped:
+                raise Exception("Appender writer thread has stopped")
+            if self.size == self.capacity:
+                if self.policy == BackpressurePolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.policy == BackpressurePolicy.DROP_OLDEST:
+                    self.head = (self.head + 1) % self.capacity
+                    self.size -= 1
+                    self.dropped += 1
+                else:
+                    while self.size == self.capacity and not self._closed and not self._stopped:
+                        self._not_full.wait()
+                    if self._closed:
+                        raise Exception("Appender is closed")
+                    if self._stopped:
+                        raise Exception("Appender writer thread has stopped")
+            self.buffer[(self.head + self.size) % self.capacity] = log_message
+            self.size += 1
+            if self.size >= self.batch_size:
+                self._not_empty.notify()
+
+    def flush(self):
+        # Block until everything queued so far is written and flushed to the file.
+        with self._lock:
+            self._flush_requested = True
+            self._not_empty.notify()
+            while self._flush_requested and self._worker.is_alive():
+                self._not_full.wait(self.flush_interval)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify()
+            self._not_full.notify_all()
+        self._worker.join()
+
+    def _take_batch(self):
+        batch = []
+        while self.size:
+            batch.append(self.buffer[self.head])
+            self.buffer[self.head] = None
+            self.head = (self.head + 1) % self.capacity
+            self.size -= 1
+        return batch
+
+    def _report_error(self, error: Exception):
+        self.errors += 1
+        print(f"AsyncQueueAppender({self.file_name}): {type(error).__name__}: {error}", file=sys.stderr)
+
+    def _drain(self):
+        try:
+            self._drain_loop()
+        except Exception as error:
+            self._report_error(error)
+        finally:
+            with self._lock:
+                self._stopped = True
+                self._flush_requested = False
+                self._not_full.notify_all()
+
+    def _drain_loop(self):
+        with open(self.file_name, "a") as f:
+            pending_bytes = 0
+            last_flush = time.monotonic()
+            while True:
+                with self._lock:
+                    if not self._closed and not self._flush_requested and self.size < self.batch_size:
+                        self._not_empty.wait(self.flush_interval)
+                    batch = self._take_batch()
+                    dropped = self.dropped - self._reported_drops
+                    self._reported_drops = self.dropped
+                    flush_requested = self._flush_requested
+                    closed = self._closed
+                    self._not_full.notify_all()
+
+                if dropped:
+                    batch.append(LogMessage(LogLevel.WARN, f"AsyncQueueAppender dropped {dropped} messages"))
+                if batch:
+                    lines = []
+                    for message in batch:
+                        try:
+                            lines.append(message.formatted(self.formatter))
+                        except Exception as error:
+                            self._report_error(error)
+                    if lines:
+                        data = "\n".join(lines) + "\n"
+                        try:
+                            f.write(data)
+                            pending_bytes += len(data)
+                        except Exception as error:
+                            self._report_error(error)
+
+                now = time.monotonic()
+                if pending_bytes and (flush_requested or closed or pending_bytes >= self.flush_bytes
+                                      or now - last_flush >= self.flush_interval):
+                    try:
+                        f.flush()
+                    except Exception as error:
+                        self._report_error(error)
+                    pending_bytes = 0
+                    last_flush = now
+
+                if flush_requested:
+                    with self._lock:
+                        if not self.size:
+                            self._flush_requested = False
+                            self._not_full.notify_all()
+                if closed and not batch:
+                    return
 
 
 # -----------------------------
@@ -82,13 +463,16 @@ class LogHandler(ABC):
     def __init__(self):
         self.next_handler = None
         self.appenders = []
+        self.loggers = []  # loggers whose dispatch table includes this handler
 
     def set_next(self, handler: 'LogHandler'):
         self.next_handler = handler
+        self._changed()
         return handler
 
     def subscribe(self, appender: LogAppender):
         self.appenders.append(appender)
+        self._changed()
 
     def notify(self, log_message: LogMessage):
         for appender in self.appenders:
@@ -100,6 +484,20 @@ class LogHandler(ABC):
         if self.next_handler:
             self.next_handler.handle(log_message)
 
+    def sinks(self, level: LogLevel) -> list:
+        # Callables this handler contributes to the logger's dispatch table for `level`.
+        if self.can_handle(level):
+            return [appender.append for appender in self.appenders]
+        return []
+
+    def _changed(self):
+        for logger in self.loggers:
+            logger.compile()
+
+    def flush(self):
+        # Emit anything the handler is holding back; Logger.flush() calls it.
+        pass
+
     @abstractmethod
     def can_handle(self, level: LogLevel) -> bool:
         pass
@@ -120,6 +518,143 @@ class ErrorHandler(LogHandler):
         return level in (LogLevel.ERROR, LogLevel.FATAL)
 
 
+class FilteringHandler(LogHandler):
+    # Handles `levels` but lets only the messages accepted by allow() reach its
+    # appenders. The compiled dispatch table calls notify() for these handlers
+    # instead of the appenders directly, so the filter runs on every path.
+    def __init__(self, levels=(LogLevel.WARN, LogLevel.ERROR, LogLevel.FATAL)):
+        super().__init__()
+        self.levels = frozenset(levels)
+        self._lock = threading.Lock()
+
+    def can_handle(self, level: LogLevel) -> bool:
+        return level in self.levels
+
+    def sinks(self, level: LogLevel) -> list:
+        if self.can_handle(level) and self.appenders:
+            return [self.notify]
+        return []
+
+    def notify(self, log_message: LogMessage):
+        for message in self.allow(log_message):
+            super().notify(message)
+
+    @abstractmethod
+    def allow(self, log_message: LogMessage) -> list:
+        # Messages to emit for this one: [] drops it, and a filter may prepend a
+        # summary of what it suppressed earlier.
+        pass
+
+
+class SamplingHandler(FilteringHandler):
+    # Keeps each message with probability `rate`.
+    def __init__(self, rate: float, levels=(LogLevel.WARN, LogLevel.ERROR, LogLevel.FATAL), rng=random.random):
+        super().__init__(levels)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("rate must be between 0 and 1")
+        self.rate = rate
+        self.rng = rng
+
+    def allow(self, log_message: LogMessage) -> list:
+        return [log_message] if self.rng() < self.rate else []
+
+
+class RateLimitingHandler(FilteringHandler):
+    # Token bucket per message template: `rate` messages per second with bursts
+    # of up to `burst`. Once a template gets a token again, the count of its
+    # messages dropped in between is logged ahead of it. At most max_buckets
+    # templates are tracked (least recently used dropped first); pass values
+    # as args rather than pre-formatting them (f-strings), or every message
+    # is its own template and nothing is limited.
+    def __init__(self, rate: float, burst: int = 10, levels=(LogLevel.WARN, LogLevel.ERROR, LogLevel.FATAL),
+                 clock=time.monotonic, max_buckets: int = 10_000):
+        super().__init__(levels)
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.buckets = LRUCache(max_buckets)  # template -> [tokens, last refill, suppressed]
+
+    def allow(self, log_message: LogMessage) -> list:
+        now = self.clock()
+        with self._lock:
+            template = log_message.template
+            if template not in self.buckets:
+                bucket = [float(self.burst), now, 0]
+                self.buckets.put(template, bucket)
+            else:
+                bucket = self.buckets.get(template)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                return []
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            summary = LogMessage(log_message.level, "Rate limit suppressed %d messages like: %s",
+                                 (suppressed, log_message.template))
+            return [summary, log_message]
+        return [log_message]
+
+
+class DedupHandler(FilteringHandler):
+    # Collapses runs of identical messages (same level and rendered text): the
+    # first is emitted, repeats within `window` seconds are counted, and a
+    # "repeated N times" line is emitted when the run ends, when the window
+    # expires (a timer started on the first repeat), or on flush().
+    def __init__(self, window: float = 1.0, levels=(LogLevel.WARN, LogLevel.ERROR, LogLevel.FATAL),
+                 clock=time.monotonic):
+        super().__init__(levels)
+        self.window = window
+        self.clock = clock
+        self._last = None
+        self._run_start = 0.0
+        self._repeats = 0
+        self._run = 0  # identifies the current run for its expiry timer
+
+    def allow(self, log_message: LogMessage) -> list:
+        key = (log_message.level, log_message.message)
+        now = self.clock()
+        with self._lock:
+            if key == self._last and now - self._run_start < self.window:
+                self._repeats += 1
+                if self._repeats == 1:
+                    timer = threading.Timer(self.window - (now - self._run_start), self._expire, (self._run,))
+                    timer.daemon = True
+                    timer.start()
+                return []
+            out = self._summary()
+            self._last = key
+            self._run_start = now
+            self._repeats = 0
+            self._run += 1
+        out.append(log_message)
+        return out
+
+    def _expire(self, run: int):
+        with self._lock:
+            if run != self._run:
+                return
+            pending = self._summary()
+            self._last = None  # the next identical message starts a new run
+        for message in pending:
+            LogHandler.notify(self, message)
+
+    def _summary(self) -> list:
+        if not self._repeats:
+            return []
+        level, message = self._last
+        summary = LogMessage(level, "Last message repeated %d times: %s", (self._repeats, message))
+        self._repeats = 0
+        return [summary]
+
+    def flush(self):
+        with self._lock:
+            pending = self._summary()
+        for message in pending:
+            LogHandler.notify(self, message)
+
+
 # -----------------------------
 # Logger (Singleton)
 # -----------------------------
@@ -130,6 +665,7 @@ class Logger:
         if Logger._instance:
             raise Exception("Use get_instance() instead of creating Logger directly.")
         self.root_handler = None
+        self.dispatch = None
 
     @staticmethod
     def get_instance():
@@ -139,19 +675,43 @@ class Logger:
 
     def add_handler_chain(self, handler: LogHandler):
         self.root_handler = handler
-
-    def log(self, level: LogLevel, message: str):
-        if not self.root_handler:
+        self.compile()
+
+    def compile(self):
+        # Flatten the handler chain into LogLevel -> tuple of appender callables.
+        # Handlers call this again whenever they are re-subscribed or re-linked.
+        table = {level: [] for level in LogLevel}
+        handler = self.root_handler
+        while handler:
+            if self not in handler.loggers:
+                handler.loggers.append(self)
+            for level in LogLevel:
+                table[level].extend(handler.sinks(level))
+            handler = handler.next_handler
+        self.dispatch = {level: tuple(sinks) for level, sinks in table.items()}
+
+    def log(self, level: LogLevel, message: str, *args):
+        if self.dispatch is None:
             raise Exception("No log handler chain set!")
-        log_message = LogMessage(level, message)
-        self.root_handler.handle(log_message)
+        sinks = self.dispatch[level]
+        if not sinks:
+            return
+        log_message = LogMessage(level, message, args)
+        for sink in sinks:
+            sink(log_message)
+
+    def flush(self):
+        handler = self.root_handler
+        while handler:
+            handler.flush()
+            handler = handler.next_handler
 
     # convenience methods
-    def debug(self, msg): self.log(LogLevel.DEBUG, msg)
-    def info(self, msg): self.log(LogLevel.INFO, msg)
-    def warn(self, msg): self.log(LogLevel.WARN, msg)
-    def error(self, msg): self.log(LogLevel.ERROR, msg)
-    def fatal(self, msg): self.log(LogLevel.FATAL, msg)
+    def debug(self, msg, *args): self.log(LogLevel.DEBUG, msg, *args)
+    def info(self, msg, *args): self.log(LogLevel.INFO, msg, *args)
+    def warn(self, msg, *args): self.log(LogLevel.WARN, msg, *args)
+    def error(self, msg, *args): self.log(LogLevel.ERROR, msg, *args)
+    def fatal(self, msg, *args): self.log(LogLevel.FATAL, msg, *args)
 
 
 # -----------------------------
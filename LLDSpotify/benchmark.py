@@ -0,0 +1,94 @@
+import gc
+import random
+import time
+import tracemalloc
+
+from LLDSpotify.catalog import SongCatalog
+from LLDSpotify.musicStreaming import Playlist, SessionRegistry, Song, StrategyType
+
+
+# -----------------------------
+# Memory per 100k playback sessions
+# -----------------------------
+def bench_sessions(sessions=100_000, playlist_size=50_000, plays_per_session=(3, 50, 500)):
+    # Per-session state must not grow with listening time, so measure short
+    # and long sessions alike (500 plays is roughly a day of music).
+    playlist = Playlist("shared")
+    for i in range(playlist_size):
+        playlist.add_song(Song(i, f"Title {i}", f"Artist {i % 1000}"))
+
+    print(f"{sessions:,} sessions over one {playlist_size:,}-song playlist")
+    print(f"{'strategy':>12} {'plays':>6} {'MiB':>10} {'bytes/session':>14} {'MiB per 1M':>12}")
+    for plays in plays_per_session:
+        count = min(sessions, max(1_000, 100_000 // plays))  # sample; totals below are scaled
+        for stype in (StrategyType.SEQUENTIAL, StrategyType.RANDOM):
+            gc.collect()
+            tracemalloc.start()
+            registry = SessionRegistry()
+            for user_id in range(count):
+                session = registry.start(user_id, playlist, stype)
+                for _ in range(plays):
+                    session.strategy.next()
+            used, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{stype.name:>12} {plays:>6} {used / 2**20 * sessions / count:>10.1f} {used / count:>14,.0f} "
+                  f"{used / count * 1_000_000 / 2**20:>12,.0f}")
+            del registry
+
+
+# -----------------------------
+# Catalog bulk load and query latency
+# -----------------------------
+class _Words:
+    # Zipf-distributed draws from a fixed pool of made-up words.
+    def __init__(self, rnd, size=50_000):
+        self.rnd = rnd
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        self.pool = ["".join(rnd.choice(letters) for _ in range(rnd.randint(3, 9))) for _ in range(size)]
+        total = 0.0
+        self.cumulative = []
+        for rank in range(1, size + 1):
+            total += 1.0 / rank
+            self.cumulative.append(total)
+
+    def __call__(self, count=1):
+        return self.rnd.choices(self.pool, cum_weights=self.cumulative, k=count)
+
+
+def bench_catalog(songs=1_000_000, queries=2_000, updates=10_000):
+    rnd = random.Random(25)
+    words = _Words(rnd)
+    artists = [" ".join(words(2)).title() for _ in range(songs // 20 or 1)]
+
+    def song(song_id):
+        return Song(song_id, " ".join(words(rnd.randint(1, 4))).title(), rnd.choice(artists))
+
+    catalog = SongCatalog()
+    start = time.perf_counter()
+    catalog.add_songs(song(i) for i in range(songs))
+    catalog.suggest("")  # sorts the vocabulary once
+    load = time.perf_counter() - start
+    print(f"bulk load: {songs:,} songs in {load:.2f}s ({songs / load:,.0f} songs/s)")
+
+    start = time.perf_counter()
+    for i in range(songs, songs + updates):
+        catalog.add_song(song(i))
+        if i % 10 == 0:
+            catalog.suggest(words()[0][:2])
+    elapsed = time.perf_counter() - start
+    print(f"incremental: {updates:,} adds with a suggest every 10 in {elapsed:.2f}s")
+
+    samples = [words(2) for _ in range(queries)]
+    for name, make in (("exact", lambda w: w[0]),
+                       ("prefix", lambda w: w[0][:3]),
+                       ("two-term", lambda w: f"{w[0]} {w[1][:2]}")):
+        texts = [make(w) for w in samples]
+        start = time.perf_counter()
+        for text in texts:
+            catalog.search(text)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10} search: {elapsed / queries * 1e3:.2f} ms/query")
+
+if __name__ == "__main__":
+    bench_sessions()
+    bench_catalog()
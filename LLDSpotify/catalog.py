@@ -0,0 +1,232 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from LLDSpotify.musicStreaming import Song
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+# -----------------------
+# Song Catalog
+# -----------------------
+class SongCatalog:
+    # Inverted indexes token -> set of song ids for titles and artists, so
+    # removing a song is O(tokens) however common they are, plus a sorted
+    # vocabulary for prefix lookups (bisect). Tokens added after the last
+    # query are kept aside and merged into the vocabulary on the next prefix
+    # lookup, so bulk loads sort once and single adds stay cheap. Tokens left
+    # without songs are dropped from the vocabulary when it is next merged.
+    #
+    # search() ANDs the query tokens; the last one also matches as a prefix
+    # (search-as-you-type). Ranking: title hits outweigh artist hits, exact
+    # tokens outweigh prefix expansions, then popularity(song_id) if given,
+    # then shorter titles.
+    #
+    # suggest() ranks every token matching the prefix. Prefixes of up to
+    # SHORT_PREFIX characters match a large part of the vocabulary, so for
+    # those the best TOP_DEPTH tokens are cached after the first scan and kept
+    # up to date as songs are added and removed; a cached list is rebuilt only
+    # when removals push it below the requested limit.
+    TITLE_WEIGHT = 2.0
+    ARTIST_WEIGHT = 1.0
+    PREFIX_FACTOR = 0.5
+    MAX_EXPANSIONS = 64
+    SHORT_PREFIX = 2
+    TOP_DEPTH = 2 * MAX_EXPANSIONS
+    INSERT_LIMIT = 1024  # merge larger batches of new tokens instead of inserting one by one
+
+    def __init__(self, popularity: Callable[[int], float] = None):
+        self.songs: Dict[int, Song] = {}
+        self.title_index: Dict[str, Set[int]] = {}
+        self.artist_index: Dict[str, Set[int]] = {}
+        self.popularity = popularity
+        self._vocabulary: List[str] = []
+        self._new_tokens = set()
+        self._dead = 0  # tokens removed from both indexes since the last merge
+        # prefix -> [sorted (-frequency, token) list, whether it holds every match]
+        self._top: Dict[str, list] = {}
+
+    # ---- updates ----
+    def add_song(self, song: Song):
+        if song.id in self.songs:
+            self.remove_song(song.id)
+        self.songs[song.id] = song
+        self._index(self.title_index, song.title, song.id)
+        self._index(self.artist_index, song.artist, song.id)
+
+    def add_songs(self, songs: Iterable[Song]):
+        for song in songs:
+            self.add_song(song)
+
+    def _index(self, index: Dict[str, Set[int]], text: str, song_id: int):
+        for token in set(tokenize(text)):
+            before = self._frequency(token) if self._top else 0
+            ids = index.get(token)
+            if ids is None:
+                index[token] = {song_id}
+                self._new_tokens.add(token)
+            else:
+                ids.add(song_id)
+            if self._top:
+                self._update_top(token, before)
+
+    def remove_song(self, song_id: int) -> Optional[Song]:
+        # Tokens left without songs stay in the vocabulary until the next merge.
+        song = self.songs.pop(song_id, None)
+        if song is None:
+            return None
+        for index, text in ((self.title_index, song.title), (self.artist_index, song.artist)):
+            for token in set(tokenize(text)):
+                before = self._frequency(token) if self._top else 0
+                ids = index[token]
+                ids.discard(song_id)
+                if not ids:
+                    del index[token]
+                    if token not in self.title_index and token not in self.artist_index:
+                        self._dead += 1
+                if self._top:
+                    self._update_top(token, before)
+        return song
+
+    # ---- prefix lookups ----
+    def _sorted_vocabulary(self) -> List[str]:
+        # Small batches are inserted in place; large ones, or a vocabulary that
+        # is mostly dead tokens, go through a merge that also drops the dead.
+        if self._new_tokens or self._dead > len(self._vocabulary) // 2:
+            fresh = sorted(self._new_tokens)
+            vocabulary = self._vocabulary
+            if len(fresh) <= self.INSERT_LIMIT and self._dead <= len(vocabulary) // 2:
+                for token in fresh:
+                    i = bisect_left(vocabulary, token)
+                    if i == len(vocabulary) or vocabulary[i] != token:
+                        vocabulary.insert(i, token)
+            else:
+                title_index, artist_index = self.title_index, self.artist_index
+                merged = []
+                for token in heapq.merge(vocabulary, fresh):
+                    if (not merged or merged[-1] != token) and (token in title_index or token in artist_index):
+                        merged.append(token)
+                self._vocabulary = merged
+                self._dead = 0
+            self._new_tokens = set()
+        return self._vocabulary
+
+    def _frequency(self, token: str) -> int:
+        return len(self.title_index.get(token, ())) + len(self.artist_index.get(token, ()))
+
+    def _scan(self, prefix: str, limit: int) -> Tuple[List[tuple], bool]:
+        # The best `limit` (-frequency, token) pairs over all indexed tokens
+        # starting with `prefix`, and whether that is all of them.
+        vocabulary = self._sorted_vocabulary()
+        candidates = []
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            frequency = self._frequency(vocabulary[i])
+            if frequency:
+                candidates.append((-frequency, vocabulary[i]))
+            i += 1
+        return heapq.nsmallest(limit, candidates), len(candidates) <= limit
+
+    def _update_top(self, token: str, before: int):
+        # Move `token` within the cached lists of its short prefixes after its
+        # frequency changed from `before`. A cached list that is not complete
+        # only ever holds tokens ranking ahead of everything left out of it.
+        after = self._frequency(token)
+        old, new = (-before, token), (-after, token)
+        for n in range(min(len(token), self.SHORT_PREFIX) + 1):
+            cached = self._top.get(token[:n])
+            if cached is None:
+                continue
+            top, complete = cached
+            i = bisect_left(top, old)
+            if i < len(top) and top[i] == old:
+                del top[i]
+            if after and (complete or (top and new < top[-1])):
+                insort(top, new)
+                if len(top) > self.TOP_DEPTH:
+                    top.pop()
+                    cached[1] = False
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        # Indexed tokens starting with `prefix`, most frequent first.
+        prefix = prefix.lower()
+        if len(prefix) > self.SHORT_PREFIX:
+            top, _ = self._scan(prefix, limit)
+        else:
+            cached = self._top.get(prefix)
+            if cached is None or (not cached[1] and len(cached[0]) < limit):
+                cached = self._top[prefix] = list(self._scan(prefix, max(limit, self.TOP_DEPTH)))
+            top = cached[0]
+        return [token for _, token in top[:limit]]
+
+    # ---- search ----
+    def _term_scores(self, tokens) -> Dict[int, float]:
+        # Best score per song over the tokens. Postings are grouped by score
+        # (only a few distinct values) and merged from the highest score down,
+        # so dict.update keeps the earlier, better value.
+        by_score: Dict[float, list] = {}
+        for token, factor in tokens:
+            for index, weight in ((self.title_index, self.TITLE_WEIGHT), (self.artist_index, self.ARTIST_WEIGHT)):
+                ids = index.get(token)
+                if ids:
+                    by_score.setdefault(weight * factor, []).append(ids)
+        scores: Dict[int, float] = {}
+        for score in sorted(by_score, reverse=True):
+            merged = dict.fromkeys(chain.from_iterable(by_score[score]), score)
+            merged.update(scores)
+            scores = merged
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> List[Song]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        per_term = []
+        for position, term in enumerate(terms):
+            tokens = [(term, 1.0)]
+            if position == len(terms) - 1:
+                tokens += [(token, self.PREFIX_FACTOR) for token in self.suggest(term, self.MAX_EXPANSIONS)
+                           if token != term]
+            per_term.append(self._term_scores(tokens))
+
+        per_term.sort(key=len)
+        totals = dict(per_term[0])
+        for scores in per_term[1:]:
+            totals = {song_id: total + scores[song_id] for song_id, total in totals.items() if song_id in scores}
+            if not totals:
+                return []
+
+        popularity = self.popularity
+        songs = self.songs
+
+        def rank(song_id):
+            return (totals[song_id], popularity(song_id) if popularity else 0.0, -len(songs[song_id].title))
+
+        return [songs[song_id] for song_id in heapq.nlargest(limit, totals, key=rank)]
+
+    def __len__(self):
+        return len(self.songs)
+
+
+if __name__ == "__main__":
+    catalog = SongCatalog()
+    catalog.add_songs([
+        Song(1, "Take Five", "Dave Brubeck"),
+        Song(2, "Imagine", "John Lennon"),
+        Song(3, "Bohemian Rhapsody", "Queen"),
+        Song(4, "Billie Jean", "Michael Jackson"),
+        Song(5, "Killer Queen", "Queen"),
+        Song(6, "Jealous Guy", "John Lennon"),
+    ])
+    print(catalog.search("queen"))
+    print(catalog.search("john im"))
+    print(catalog.suggest("j"))
+    catalog.add_song(Song(7, "Five Years", "David Bowie"))
+    print(catalog.search("fi"))
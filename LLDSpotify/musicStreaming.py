@@ -1,9 +1,13 @@
 # music_system.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections import deque
 from enum import Enum
 import random
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
+
+from LRUCache.lru import LRUCache
 
 
 # -----------------------
@@ -21,21 +25,90 @@ class Song:
 
 
 class Playlist:
+    # Songs sit in `slots` in play order and `index` maps song id -> slot numbers.
+    # remove_song() tombstones slots (None) and compacts only once tombstones
+    # outnumber live songs, so removal is O(1) amortized. compact() and insert()
+    # move songs to other slots and bump `version`; cursors holding a slot
+    # number from an older version translate it with remap().
+    COMPACT_MIN = 64
+    MAX_CHANGES = 32
+
     def __init__(self, name: str):
         self.name = name
-        self.songs: List[Song] = []
+        self.slots: List[Optional[Song]] = []
+        self.index: Dict[int, List[int]] = {}
+        self.live = 0
+        self.version = 0
+        self.changes = []  # (version, "compact", sorted dead slots) or (version, "insert", slot)
 
     def add_song(self, song: Song):
-        self.songs.append(song)
+        self.index.setdefault(song.id, []).append(len(self.slots))
+        self.slots.append(song)
+        self.live += 1
+
+    def insert(self, slot: int, song: Song):
+        # O(n): shifts every later slot.
+        slot = max(0, min(slot, len(self.slots)))
+        self.slots.insert(slot, song)
+        self.live += 1
+        self._reindex("insert", slot)
 
     def remove_song(self, song_id: int):
-        self.songs = [s for s in self.songs if s.id != song_id]
+        for slot in self.index.pop(song_id, ()):
+            self.slots[slot] = None
+            self.live -= 1
+        if len(self.slots) - self.live > max(self.live, self.COMPACT_MIN):
+            self.compact()
+
+    def compact(self):
+        dead = [slot for slot, song in enumerate(self.slots) if song is None]
+        if dead:
+            self.slots = [song for song in self.slots if song is not None]
+            self._reindex("compact", dead)
+
+    def _reindex(self, kind: str, data):
+        self.index = {}
+        for slot, song in enumerate(self.slots):
+            if song is not None:
+                self.index.setdefault(song.id, []).append(slot)
+        self.version += 1
+        self.changes.append((self.version, kind, data))
+        if len(self.changes) > self.MAX_CHANGES:
+            del self.changes[0]
+
+    def remap(self, slot: int, since_version: int) -> Optional[int]:
+        # Where `slot` of layout `since_version` is now; a slot that was
+        # compacted away maps to the live slot before it. None if the change
+        # log no longer reaches back that far.
+        if since_version == self.version:
+            return slot
+        if not self.changes or self.changes[0][0] > since_version + 1:
+            return None
+        for version, kind, data in self.changes:
+            if version <= since_version:
+                continue
+            if kind == "compact":
+                slot -= bisect_right(data, slot)
+            elif data <= slot:
+                slot += 1
+        return slot
+
+    def position_of(self, song_id: int) -> Optional[int]:
+        slots = self.index.get(song_id)
+        return slots[0] if slots else None
+
+    def __len__(self):
+        return self.live
+
+    def __iter__(self) -> Iterator[Song]:
+        return (song for song in self.slots if song is not None)
 
     def get_songs(self) -> List[Song]:
-        return self.songs.copy()
+        # A copy; iterate the playlist directly to avoid it.
+        return list(self)
 
     def __repr__(self):
-        return f"Playlist('{self.name}', {len(self.songs)} songs)"
+        return f"Playlist('{self.name}', {self.live} songs)"
 
 
 # -----------------------
@@ -48,6 +121,10 @@ class StrategyType(Enum):
 
 
 class PlayStrategy(ABC):
+    # Strategies are per-session cursors: they reference the playlist, never
+    # copy it, and use __slots__ so a registry can hold millions of them.
+    __slots__ = ()
+
     @abstractmethod
     def set_playlist(self, playlist: Playlist):
         pass
@@ -74,84 +151,239 @@ class PlayStrategy(ABC):
 
 
 class SequentialPlayStrategy(PlayStrategy):
+    # Walks the playlist's slots in order, skipping tombstones. `song` is the
+    # song at the cursor, used to find it again when the playlist's change
+    # log no longer reaches back to the cursor's version. add_to_next() queues
+    # songs for this session only (`up_next`) and never touches the shared
+    # playlist; `queued` is the queued song now playing, if any, and
+    # previous() from it returns to the song at the cursor.
+    __slots__ = ('playlist', 'index', 'version', 'song', 'up_next', 'queued')
+
     def __init__(self):
         self.playlist: Optional[Playlist] = None
         self.index: int = -1
+        self.version: int = 0
+        self.song: Optional[Song] = None
+        self.up_next: Optional[deque] = None  # created on first add_to_next()
+        self.queued: Optional[Song] = None
 
     def set_playlist(self, playlist: Playlist):
         self.playlist = playlist
         self.index = -1
+        self.version = playlist.version
+        self.song = None
+        self.up_next = None
+        self.queued = None
+
+    def _sync(self):
+        playlist = self.playlist
+        if self.version != playlist.version:
+            slot = playlist.remap(self.index, self.version)
+            if slot is None and self.song is not None:
+                slot = playlist.position_of(self.song.id)
+                if slot is None:  # the song itself was removed: stay near where it was
+                    slot = min(self.index, len(playlist.slots) - 1)
+            self.index = slot if slot is not None else -1
+            self.version = playlist.version
+
+    def _next_slot(self) -> Optional[int]:
+        slots = self.playlist.slots
+        for slot in range(self.index + 1, len(slots)):
+            if slots[slot] is not None:
+                return slot
+        return None
 
     def has_next(self) -> bool:
-        if not self.playlist:
+        if self.up_next:
+            return True
+        if self.playlist is None:
             return False
-        return self.index + 1 < len(self.playlist.songs)
+        self._sync()
+        return self._next_slot() is not None
 
     def next(self) -> Optional[Song]:
-        if not self.playlist or not self.has_next():
+        if self.up_next:
+            self.queued = self.up_next.popleft()
+            return self.queued
+        self.queued = None
+        if self.playlist is None:
             return None
-        self.index += 1
-        return self.playlist.songs[self.index]
+        self._sync()
+        slot = self._next_slot()
+        if slot is None:
+            return None
+        self.index = slot
+        self.song = self.playlist.slots[slot]
+        return self.song
 
     def previous(self) -> Optional[Song]:
-        if not self.playlist or self.index - 1 < 0:
+        queued, self.queued = self.queued, None
+        if self.playlist is None:
             return None
-        self.index -= 1
-        return self.playlist.songs[self.index]
+        self._sync()
+        slots = self.playlist.slots
+        if queued is not None and 0 <= self.index < len(slots) and slots[self.index] is not None:
+            return slots[self.index]
+        for slot in range(min(self.index, len(slots)) - 1, -1, -1):
+            if slots[slot] is not None:
+                self.index = slot
+                self.song = slots[slot]
+                return self.song
+        return None
 
     def current(self) -> Optional[Song]:
-        if not self.playlist or self.index < 0 or self.index >= len(self.playlist.songs):
+        if self.queued is not None:
+            return self.queued
+        if self.playlist is None:
             return None
-        return self.playlist.songs[self.index]
+        self._sync()
+        if self.index < 0 or self.index >= len(self.playlist.slots):
+            return None
+        return self.playlist.slots[self.index]
 
     def add_to_next(self, song: Song):
-        if self.playlist:
-            insert_at = min(self.index + 1, len(self.playlist.songs))
-            self.playlist.songs.insert(insert_at, song)
+        if self.up_next is None:
+            self.up_next = deque()
+        self.up_next.appendleft(song)
+
+
+def _mix64(x: int) -> int:
+    # splitmix64 finalizer: every input bit affects every output bit.
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return x ^ (x >> 31)
 
 
 class RandomPlayStrategy(PlayStrategy):
-    def __init__(self):
+    # The shuffle is a keyed pseudorandom permutation of slot numbers (a small
+    # Feistel network, cycle-walked back into range), so a session keeps only
+    # a key and a draw count: starting a shuffle and next() are O(1) and the
+    # state does not grow with the number of plays. Songs appended during a
+    # shuffle are shuffled after the ones it started with. After the playlist
+    # is compacted or inserted into, the shuffle restarts over the new layout,
+    # skipping songs still in the recent history. `history` keeps the last
+    # HISTORY_LIMIT to 2 * HISTORY_LIMIT songs played, for previous().
+    HISTORY_LIMIT = 64
+    _ROUNDS = 8
+    __slots__ = ('playlist', 'rng', 'history', 'position', 'up_next', '_key', '_base', '_size', '_drawn',
+                 '_reshuffled', '_peeked', '_version')
+
+    def __init__(self, rng: random.Random = None):
         self.playlist: Optional[Playlist] = None
-        self.queue: List[Song] = []
+        self.rng = rng if rng is not None else random  # module-level generator unless given one
         self.history: List[Song] = []
+        self.position = -1
+        self.up_next: Optional[deque] = None  # created on first add_to_next()
+        self._key = 0
+        self._base = 0
+        self._size = 0
+        self._drawn = 0
+        self._reshuffled = False
+        self._peeked: Optional[Song] = None
+        self._version = 0
 
     def set_playlist(self, playlist: Playlist):
         self.playlist = playlist
-        self.queue = playlist.get_songs().copy()
-        random.shuffle(self.queue)
         self.history = []
+        self.position = -1
+        self.up_next = None
+        self._peeked = None
+        self._reshuffled = False
+        self._shuffle(0)
+
+    def _shuffle(self, base: int):
+        # Start a permutation of slots[base:].
+        self._key = self.rng.getrandbits(64)
+        self._base = base
+        self._size = len(self.playlist.slots) - base
+        self._drawn = 0
+        self._version = self.playlist.version
+
+    def _permute(self, i: int) -> int:
+        size, key = self._size, self._key
+        half = max(1, ((size - 1).bit_length() + 1) // 2)
+        mask = (1 << half) - 1
+        while True:
+            left, right = i >> half, i & mask
+            for round_ in range(self._ROUNDS):
+                left, right = right, left ^ (_mix64(key + round_ * 0x9E3779B97F4A7C15 + right) & mask)
+            i = (left << half) | right
+            if i < size:
+                return i
+
+    def _draw(self) -> Optional[Song]:
+        playlist = self.playlist
+        if self._version != playlist.version:
+            self._shuffle(0)
+            self._reshuffled = True
+        slots = playlist.slots
+        while True:
+            if self._drawn >= self._size:
+                if len(slots) <= self._base + self._size:
+                    return None
+                self._shuffle(self._base + self._size)
+            k = self._drawn
+            self._drawn = k + 1
+            song = slots[self._base + self._permute(k)]
+            if song is not None and not (self._reshuffled and self._recent(song)):
+                return song
+
+    def _recent(self, song: Song) -> bool:
+        return song is self._peeked or any(played is song for played in self.history)
+
+    def _record(self, song: Song):
+        history = self.history
+        history.append(song)
+        self.position += 1
+        if len(history) > 2 * self.HISTORY_LIMIT:
+            del history[:self.HISTORY_LIMIT]
+            self.position -= self.HISTORY_LIMIT
 
     def has_next(self) -> bool:
-        return len(self.queue) > 0
+        if self.position + 1 < len(self.history) or self.up_next or self._peeked:
+            return True
+        if self.playlist is None:
+            return False
+        self._peeked = self._draw()
+        return self._peeked is not None
 
     def next(self) -> Optional[Song]:
-        if not self.has_next():
+        if self.position + 1 < len(self.history):
+            self.position += 1
+            return self.history[self.position]
+        if self.up_next:
+            song = self.up_next.popleft()
+        elif self._peeked:
+            song, self._peeked = self._peeked, None
+        elif self.playlist is not None:
+            song = self._draw()
+        else:
+            song = None
+        if song is None:
             return None
-        song = self.queue.pop(0)
-        self.history.append(song)
+        self._record(song)
         return song
 
     def previous(self) -> Optional[Song]:
-        if not self.history:
+        if self.position <= 0:
             return None
-        # move last from history to front of queue and return previous item
-        last = self.history.pop()
-        # previous is now last item in history
-        prev = self.history[-1] if self.history else None
-        if prev:
-            return prev
-        return None
+        self.position -= 1
+        return self.history[self.position]
 
     def current(self) -> Optional[Song]:
-        return self.history[-1] if self.history else None
+        return self.history[self.position] if self.position >= 0 else None
 
     def add_to_next(self, song: Song):
-        self.queue.insert(0, song)
+        if self.up_next is None:
+            self.up_next = deque()
+        self.up_next.appendleft(song)
 
 
 class CustomPlayStrategy(PlayStrategy):
     # Custom behavior (for example user-defined order). Here we maintain a custom queue.
+    # Unlike the other strategies it owns a copy, since the user may reorder it.
+    __slots__ = ('custom_queue', 'index')
+
     def __init__(self):
         self.custom_queue: List[Song] = []
         self.index = -1
@@ -191,12 +423,15 @@ class CustomPlayStrategy(PlayStrategy):
 # -----------------------
 class StrategyManager:
     _instance = None
+    _factories = {
+        StrategyType.SEQUENTIAL: SequentialPlayStrategy,
+        StrategyType.RANDOM: RandomPlayStrategy,
+        StrategyType.CUSTOM: CustomPlayStrategy,
+    }
 
     def __init__(self):
         self._strategies: Dict[StrategyType, PlayStrategy] = {
-            StrategyType.SEQUENTIAL: SequentialPlayStrategy(),
-            StrategyType.RANDOM: RandomPlayStrategy(),
-            StrategyType.CUSTOM: CustomPlayStrategy(),
+            stype: factory() for stype, factory in self._factories.items()
         }
 
     @classmethod
@@ -206,9 +441,56 @@ class StrategyManager:
         return cls._instance
 
     def get_strategy(self, stype: StrategyType) -> PlayStrategy:
-        # Return a fresh instance or a reusable one depending on needs.
+        # Shared instance: every caller moves the same cursor. Sessions use create_strategy().
         return self._strategies[stype]
 
+    def create_strategy(self, stype: StrategyType) -> PlayStrategy:
+        return self._factories[stype]()
+
+
+# -----------------------
+# Playback Sessions
+# -----------------------
+class PlaybackSession:
+    # One user's playback state: a private strategy cursor over a shared playlist.
+    __slots__ = ('user_id', 'playlist', 'strategy', 'is_playing')
+
+    def __init__(self, user_id, playlist: Playlist, strategy: PlayStrategy):
+        self.user_id = user_id
+        self.playlist = playlist
+        self.strategy = strategy
+        self.is_playing = False
+        strategy.set_playlist(playlist)
+
+    def __repr__(self):
+        return f"PlaybackSession({self.user_id!r}, {self.playlist.name!r}, {type(self.strategy).__name__})"
+
+
+class SessionRegistry:
+    # user id -> PlaybackSession. Once max_sessions is reached the least
+    # recently used session is dropped; pass max_sessions=None for no limit.
+    MAX_SESSIONS = 1_000_000
+
+    def __init__(self, max_sessions: Optional[int] = MAX_SESSIONS, strategy_manager: StrategyManager = None):
+        self.sessions = LRUCache(max_sessions)
+        self.strategy_manager = strategy_manager or StrategyManager.instance()
+
+    def start(self, user_id, playlist: Playlist, stype: StrategyType) -> PlaybackSession:
+        session = PlaybackSession(user_id, playlist, self.strategy_manager.create_strategy(stype))
+        self.sessions.put(user_id, session)
+        return session
+
+    def get(self, user_id) -> Optional[PlaybackSession]:
+        session = self.sessions.get(user_id)
+        return None if session == -1 else session
+
+    def end(self, user_id):
+        if user_id in self.sessions:
+            self.sessions.remove(user_id)
+
+    def __len__(self):
+        return len(self.sessions)
+
 
 # -----------------------
 # Playlist Manager (Singleton)
@@ -371,16 +653,18 @@ class AudioEngine:
 # MusicPlayerFacade (Singleton)
 # -----------------------
 class MusicPlayerFacade:
+    # Playback state lives in per-user sessions, so users sharing the facade
+    # (and a playlist) keep independent cursors. Calls without a user_id act
+    # on DEFAULT_USER.
     _instance = None
+    DEFAULT_USER = "default"
 
     def __init__(self):
         self.playlist_manager = PlaylistManager.instance()
         self.strategy_manager = StrategyManager.instance()
         self.device_manager = DeviceManager.instance()
         self.audio_engine = AudioEngine()
-        self.current_strategy: Optional[PlayStrategy] = None
-        self.current_playlist: Optional[Playlist] = None
-        self.is_playing = False
+        self.sessions = SessionRegistry(strategy_manager=self.strategy_manager)
 
     @classmethod
     def instance(cls) -> MusicPlayerFacade:
@@ -394,21 +678,17 @@ class MusicPlayerFacade:
 
     def add_song_to_playlist(self, playlist_name: str, song: Song):
         pl = self.playlist_manager.get_playlist(playlist_name)
-        if not pl:
+        if pl is None:
             raise ValueError("Playlist not found")
         pl.add_song(song)
         print(f"[Facade] Added {song} to playlist '{playlist_name}'")
 
     # Strategy operations
-    def set_play_strategy(self, stype: StrategyType, playlist_name: str):
+    def set_play_strategy(self, stype: StrategyType, playlist_name: str, user_id=DEFAULT_USER):
         pl = self.playlist_manager.get_playlist(playlist_name)
-        if not pl:
+        if pl is None:
             raise ValueError("Playlist not found")
-        strat = self.strategy_manager.get_strategy(stype)
-        # NOTE: we clone or reinitialize strategy instance if needed; here we just reuse
-        strat.set_playlist(pl)
-        self.current_strategy = strat
-        self.current_playlist = pl
+        self.sessions.start(user_id, pl, stype)
         print(f"[Facade] Strategy set to {stype.name} for playlist '{playlist_name}'")
 
     # Device operations
@@ -419,51 +699,56 @@ class MusicPlayerFacade:
         self.device_manager.disconnect()
 
     # Playback operations
-    def play(self):
-        if not self.current_strategy:
+    def play(self, user_id=DEFAULT_USER):
+        session = self.sessions.get(user_id)
+        if session is None:
             print("[Facade] No strategy/playlist set. Cannot play.")
             return
-        next_song = self.current_strategy.next()
+        next_song = session.strategy.next()
         if not next_song:
             print("[Facade] Nothing to play.")
             return
         self.audio_engine.play(next_song)
-        self.is_playing = True
+        session.is_playing = True
         print(f"[Facade] Playing: {next_song}")
 
-    def pause(self):
-        if self.is_playing:
+    def pause(self, user_id=DEFAULT_USER):
+        session = self.sessions.get(user_id)
+        if session is not None and session.is_playing:
             self.audio_engine.stop()
-            self.is_playing = False
+            session.is_playing = False
             print("[Facade] Paused")
 
-    def next(self):
-        if not self.current_strategy:
+    def next(self, user_id=DEFAULT_USER):
+        session = self.sessions.get(user_id)
+        if session is None:
             print("[Facade] No strategy set.")
             return
-        next_song = self.current_strategy.next()
+        next_song = session.strategy.next()
         if next_song:
             self.audio_engine.play(next_song)
             print(f"[Facade] Next: {next_song}")
         else:
             print("[Facade] No next song.")
 
-    def previous(self):
-        if not self.current_strategy:
+    def previous(self, user_id=DEFAULT_USER):
+        session = self.sessions.get(user_id)
+        if session is None:
             print("[Facade] No strategy set.")
             return
-        prev_song = self.current_strategy.previous()
+        prev_song = session.strategy.previous()
         if prev_song:
             self.audio_engine.play(prev_song)
             print(f"[Facade] Previous: {prev_song}")
         else:
             print("[Facade] No previous song.")
 
-    def add_to_next(self, song: Song):
-        if not self.current_strategy:
+    def add_to_next(self, song: Song, user_id=DEFAULT_USER):
+        session = self.sessions.get(user_id)
+        if session is None:
             print("[Facade] No strategy set.")
             return
-        self.current_strategy.add_to_next(song)
+        session.strategy.add_to_next(song)
         print(f"[Facade] Added to next: {song}")
 
 
@@ -493,12 +778,17 @@ if __name__ == "__main__":
     facade.play()        # plays first
     facade.next()        # plays second
     facade.add_to_next(Song(99, "New Song", "New Artist"))
-    facade.next()        # plays the added song (if inserted)
-    facade.previous()    # goes back
+    facade.next()        # plays the added song, queued for this user only
+    facade.previous()    # goes back to the second song
     facade.pause()       # pause
 
     # Switch to random strategy
     facade.set_play_strategy(StrategyType.RANDOM, "Favorites")
     facade.play()
     facade.next()
+
+    # A second user on the same playlist keeps their own cursor
+    facade.set_play_strategy(StrategyType.SEQUENTIAL, "Favorites", user_id="bob")
+    facade.play(user_id="bob")
+    facade.next()
     facade.disconnect_device()
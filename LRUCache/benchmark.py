@@ -0,0 +1,278 @@
+import contextlib
+import io
+import itertools
+import multiprocessing
+import random
+import threading
+import time
+
+from LRUCache.concurrentCache import ConcurrentLRUCache
+from LRUCache.lru import LRUCache
+from LRUCache.policies import SegmentedLRUCache, TwoQueueCache, WTinyLFUCache
+from LRUCache.sharedCache import SharedLRUCache
+
+
+# -----------------------------
+# Baseline: the original list-walking cache
+# -----------------------------
+class _ListNode:
+    def __init__(self, key):
+        self.key = key
+        self.prev = None
+        self.next = None
+
+
+class LinkedListLRUCache:
+    # Kept verbatim for comparison: remove(key) walks from head and every
+    # operation prints the whole list and map.
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.map = {}
+        self.head = _ListNode(-1)
+        self.last = _ListNode(-1)
+        self.head.next = self.last
+        self.last.prev = self.head
+
+    def print(self):
+        node = self.head.next
+        while(node != self.last):
+            print(str(node.key)+ '-->')
+            node=node.next
+
+        print('============')
+        print(self.map)
+        print('============')
+
+    def put(self,key, value):
+        if self.map.get(key):
+            self.reset(key, value)
+        else:
+            if len(self.map) < self.capacity:
+                self.add(key, value)
+            else:
+                self.add(key, value)
+                self.remove()
+
+        self.print()
+
+    def get(self,key):
+        if self.map.get(key):
+            self.reset(key, self.map.get(key))
+            self.print()
+            return self.map.get(key)
+        self.print()
+        return -1
+
+    def reset(self, key, value):
+        self.map[key] = value
+        self.remove(key)
+        self.add(key, value)
+        self.print()
+
+    def add(self,key, value):
+        self.map[key] = value
+        node = _ListNode(key)
+        prevNode = self.last.prev
+        prevNode.next = node
+        node.next = self.last
+        node.prev = prevNode
+        self.last.prev = node
+
+    def remove(self, key=None):
+        if key:
+            node = self.head
+            self.map.pop(key)
+            while(node.next):
+                if node.key == key:
+                    break
+                node = node.next
+            node.prev.next =node.next
+            node.next.prev =node.prev
+            node.prev = None
+            node.next = None
+
+        else:
+            node = self.head.next
+            self.map.pop(node.key)
+            self.head.next = node.next
+            node.next.prev = self.head
+            node.prev = None
+            node.next = None
+
+
+# -----------------------------
+# Node-map LRUCache vs. baseline
+# -----------------------------
+def _fill(cache, n):
+    # add() skips the per-operation print on the baseline, so filling stays O(n).
+    for i in range(1, n + 1):
+        cache.add(i, i)
+
+
+def _run_ops(cache, n, ops, seed=7):
+    rnd = random.Random(seed)
+    keys = [rnd.randint(1, 2 * n) for _ in range(ops)]
+    sink = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sink):
+        for i, key in enumerate(keys):
+            if i & 1:
+                cache.put(key, key)
+            else:
+                cache.get(key)
+    return time.perf_counter() - start
+
+
+def bench_node_map(sizes=(10 ** 3, 10 ** 5, 10 ** 6), ops=200_000, baseline_budget=2 * 10 ** 6):
+    print(f"{'entries':>10} {'cache':>20} {'ops':>8} {'us/op':>12}")
+    for n in sizes:
+        cache = LRUCache(n)
+        _fill(cache, n)
+        elapsed = _run_ops(cache, n, ops)
+        print(f"{n:>10} {'LRUCache':>20} {ops:>8} {elapsed / ops * 1e6:>12.3f}")
+
+        # Every baseline op is O(n), so cap its total work at ~baseline_budget node visits.
+        baseline_ops = max(2, min(ops, baseline_budget // n))
+        baseline = LinkedListLRUCache(n)
+        _fill(baseline, n)
+        elapsed = _run_ops(baseline, n, baseline_ops)
+        print(f"{n:>10} {'LinkedListLRUCache':>20} {baseline_ops:>8} {elapsed / baseline_ops * 1e6:>12.3f}")
+
+
+# -----------------------------
+# ConcurrentLRUCache throughput vs. thread count
+# -----------------------------
+def _hammer(cache, keys, barrier):
+    barrier.wait()
+    for i, key in enumerate(keys):
+        if i & 3 == 0:
+            cache.put(key, key)
+        else:
+            cache.get(key)
+
+
+def bench_concurrent(thread_counts=(1, 2, 4, 8, 16), ops_per_thread=50_000, capacity=10_000, segment_counts=(1, 16)):
+    print(f"{'segments':>8} {'threads':>8} {'ops/sec':>14} {'hit_ratio':>10}")
+    for segments in segment_counts:
+        for threads in thread_counts:
+            cache = ConcurrentLRUCache(capacity, segments=segments)
+            rnd = random.Random(threads)
+            workloads = [[rnd.randint(0, 2 * capacity) for _ in range(ops_per_thread)] for _ in range(threads)]
+            barrier = threading.Barrier(threads + 1)
+            workers = [threading.Thread(target=_hammer, args=(cache, keys, barrier)) for keys in workloads]
+            for worker in workers:
+                worker.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            total = threads * ops_per_thread
+            print(f"{segments:>8} {threads:>8} {total / elapsed:>14,.0f} {cache.stats()['hit_ratio']:>10.3f}")
+
+
+# -----------------------------
+# Eviction policies: trace replay
+# -----------------------------
+def zipf_trace(keys, length, s=1.0, seed=11):
+    rnd = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, keys + 1)))
+    return rnd.choices(range(keys), cum_weights=cum_weights, k=length)
+
+
+def scan_trace(keys, length, scan_every=20_000, scan_length=5_000, s=1.0, seed=13):
+    # Zipfian hot set interrupted by sequential scans over keys that are never seen again.
+    trace = zipf_trace(keys, length, s, seed)
+    result = []
+    next_cold = keys
+    for start in range(0, length, scan_every):
+        result.extend(trace[start:start + scan_every])
+        result.extend(range(next_cold, next_cold + scan_length))
+        next_cold += scan_length
+    return result
+
+
+def replay(cache, trace):
+    hits = 0
+    start = time.perf_counter()
+    for key in trace:
+        if cache.get(key) == -1:
+            cache.put(key, key)
+        else:
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return hits / len(trace), len(trace) / elapsed
+
+
+POLICIES = {
+    "LRU": LRUCache,
+    "SLRU": SegmentedLRUCache,
+    "2Q": TwoQueueCache,
+    "W-TinyLFU": WTinyLFUCache,
+}
+
+
+def bench_policies(capacity=1_000, keys=100_000, length=200_000):
+    traces = {
+        "zipf": zipf_trace(keys, length),
+        "scan": scan_trace(keys, length),
+    }
+    print(f"{'trace':>6} {'policy':>10} {'hit_ratio':>10} {'ops/sec':>14}")
+    for trace_name, trace in traces.items():
+        for policy_name, policy in POLICIES.items():
+            hit_ratio, ops = replay(policy(capacity), trace)
+            print(f"{trace_name:>6} {policy_name:>10} {hit_ratio:>10.4f} {ops:>14,.0f}")
+
+
+# -----------------------------
+# Cross-process hits: SharedLRUCache vs. Manager dict
+# -----------------------------
+def _time_gets(store, keys, results):
+    start = time.perf_counter()
+    for key in keys:
+        store.get(key)
+    results.put((time.perf_counter() - start) / len(keys))
+
+
+def _cross_process_latency(store, keys, processes):
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_time_gets, args=(store, keys, results)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    latencies = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return sum(latencies) / len(latencies)
+
+
+def bench_shared(process_counts=(1, 4), entries=1_000, gets=20_000, value_size=128):
+    rnd = random.Random(5)
+    value = bytes(value_size)
+    keys = [f"key-{rnd.randrange(entries)}" for _ in range(gets)]
+    print(f"{'store':>16} {'processes':>10} {'us/get':>10}")
+
+    shared = SharedLRUCache(capacity=entries, key_size=16, value_size=value_size)
+    try:
+        for i in range(entries):
+            shared.put(f"key-{i}", value)
+        for processes in process_counts:
+            latency = _cross_process_latency(shared, keys, processes)
+            print(f"{'SharedLRUCache':>16} {processes:>10} {latency * 1e6:>10.2f}")
+    finally:
+        shared.close()
+        shared.unlink()
+
+    with multiprocessing.Manager() as manager:
+        store = manager.dict()
+        for i in range(entries):
+            store[f"key-{i}"] = value
+        for processes in process_counts:
+            latency = _cross_process_latency(store, keys, processes)
+            print(f"{'Manager().dict':>16} {processes:>10} {latency * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    bench_node_map()
+    bench_concurrent()
+    bench_policies()
+    bench_shared()
@@ -0,0 +1,97 @@
+import threading
+
+from LRUCache.lru import LRUCache
+
+
+class CacheSegment:
+    __slots__ = ('cache', 'lock', 'hits', 'misses', 'evictions')
+
+    def __init__(self, capacity):
+        self.cache = LRUCache(capacity)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class ConcurrentLRUCache:
+    # Lock striping: the key space is split across independently locked LRUCache
+    # segments, so threads touching different segments never contend. Recency is
+    # tracked per segment, which makes eviction an approximation of global LRU.
+    # capacity is split exactly: the first capacity % segments segments hold
+    # one entry more than the rest, so the total never exceeds capacity. A
+    # capacity below the segment count uses one segment per entry instead, so
+    # no segment is left unable to hold anything.
+    def __init__(self, capacity, segments=16):
+        if segments < 1:
+            raise ValueError("segments must be >= 1")
+        self.capacity = capacity
+        segments = max(1, min(segments, capacity))
+        base, extra = divmod(capacity, segments)
+        self.segments = [CacheSegment(base + (1 if i < extra else 0)) for i in range(segments)]
+
+    def _segment(self, key):
+        return self.segments[hash(key) % len(self.segments)]
+
+    def get(self, key):
+        segment = self._segment(key)
+        with segment.lock:
+            if key not in segment.cache:
+                segment.misses += 1
+                return -1
+            segment.hits += 1
+            return segment.cache.get(key)
+
+    def put(self, key, value):
+        segment = self._segment(key)
+        with segment.lock:
+            cache = segment.cache
+            expected = len(cache) + (0 if key in cache else 1)
+            cache.put(key, value)
+            segment.evictions += expected - len(cache)
+
+    def remove(self, key):
+        segment = self._segment(key)
+        with segment.lock:
+            if key not in segment.cache:
+                return False
+            segment.cache.remove(key)
+            return True
+
+    def __len__(self):
+        return sum(len(segment.cache) for segment in self.segments)
+
+    def __contains__(self, key):
+        segment = self._segment(key)
+        with segment.lock:
+            return key in segment.cache
+
+    def stats(self):
+        totals = {"hits": 0, "misses": 0, "evictions": 0, "size": 0}
+        for segment in self.segments:
+            with segment.lock:
+                totals["hits"] += segment.hits
+                totals["misses"] += segment.misses
+                totals["evictions"] += segment.evictions
+                totals["size"] += len(segment.cache)
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_ratio"] = totals["hits"] / lookups if lookups else 0.0
+        return totals
+
+
+if __name__ == '__main__':
+    cache = ConcurrentLRUCache(8, segments=4)
+
+    def worker(offset):
+        for i in range(100):
+            key = (offset + i) % 12
+            if cache.get(key) == -1:
+                cache.put(key, f"value-{key}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(cache.stats())
@@ -1,19 +1,55 @@
+import time
+
+_DEFAULT_TTL = object()  # put() without ttl= uses the cache's default
+
+
 class Node:
-    def __init__(self, key):
+    __slots__ = ('key', 'value', 'weight', 'expires_at', 'prev', 'next')
+
+    def __init__(self, key, value=None, weight=0, expires_at=None):
         self.key = key
-        self.prev= None
+        self.value = value
+        self.weight = weight
+        self.expires_at = expires_at
+        self.prev = None
         self.next = None
 
 
 class LRUCache:
-    def __init__(self, capacity):
+    # map holds key -> Node, so get / put / evict never walk the list.
+    # Pass debug=True to dump the list and map after every operation.
+    #
+    # Optional limits:
+    #   weigher(key, value) + max_weight -> evict LRU entries until the total weight fits
+    #   ttl (default) or put(..., ttl=)   -> entries expire; reclaimed lazily on access and
+    #                                        by sweep(), which inspects at most sweep_batch
+    #                                        entries per put so no call scans the whole cache.
+    #                                        put(..., ttl=None) stores an entry that never expires
+    def __init__(self, capacity, debug=False, weigher=None, max_weight=None, ttl=None,
+                 sweep_batch=8, clock=time.monotonic):
         self.capacity = capacity
+        self.debug = debug
+        self.weigher = weigher
+        self.max_weight = max_weight
+        self.ttl = ttl
+        self.sweep_batch = sweep_batch
+        self.clock = clock
+        self.weight = 0
         self.map = {}
         self.head = Node(-1)
         self.last = Node(-1)
         self.head.next = self.last
         self.last.prev = self.head
+        self._cursor = None
+        self._expiring = ttl is not None
 
+    def __len__(self):
+        # O(1): counts expired entries that have not been reclaimed yet. Call
+        # sweep(len(cache)) first for an exact count of live entries.
+        return len(self.map)
+
+    def __contains__(self, key):
+        return self._live(key) is not None
 
     def print(self):
         node = self.head.next
@@ -22,77 +58,128 @@ class LRUCache:
             node=node.next
 
         print('============')
-        print(self.map)
+        print({key: node.value for key, node in self.map.items()})
         print('============')
 
         return
 
-    def put(self,key, value):
-        if self.map.get(key):
-            self.reset(key, value)
+    def put(self,key, value, ttl=_DEFAULT_TTL):
+        weight = self.weigher(key, value) if self.weigher else 0
+        if self.max_weight is not None and weight > self.max_weight:
+            # Can never fit; drop any older copy rather than flushing the cache for it.
+            if key in self.map:
+                self.remove(key)
+            return
+
+        if ttl is _DEFAULT_TTL:
+            ttl = self.ttl
+        elif ttl is not None:
+            self._expiring = True
+        expires_at = self.clock() + ttl if ttl is not None else None
+
+        if key in self.map:
+            self.reset(key, value, weight, expires_at)
         else:
-            if len(self.map) < self.capacity:
-                self.add(key, value)
-            else:
-                self.add(key, value)
-                self.remove()
-
-        self.print()
+            self.add(key, value, weight, expires_at)
 
-    def get(self,key):
-        if self.map.get(key):
-            self.reset(key, self.map.get(key))
-            self.print()
-            return self.map.get(key)
-        self.print()
-        return -1
+        while ((self.capacity is not None and len(self.map) > self.capacity)
+               or (self.max_weight is not None and self.weight > self.max_weight)):
+            self.remove()
 
+        if self._expiring and self.sweep_batch:
+            self.sweep(self.sweep_batch)
 
-    def reset(self, key, value):
-        self.map[key] = value
-        self.remove(key)
-        self.add(key, value)
-        self.print()
+        if self.debug:
+            self.print()
 
+    def get(self,key):
+        node = self._live(key)
+        if node is None:
+            if self.debug:
+                self.print()
+            return -1
+        self._unlink(node)
+        self._append(node)
+        if self.debug:
+            self.print()
+        return node.value
+
+    def reset(self, key, value, weight=0, expires_at=None):
+        node = self.map[key]
+        self.weight += weight - node.weight
+        node.value = value
+        node.weight = weight
+        node.expires_at = expires_at
+        self._unlink(node)
+        self._append(node)
+
+    def add(self,key, value, weight=0, expires_at=None):
+        node = Node(key, value, weight, expires_at)
+        self.map[key] = node
+        self.weight += weight
+        self._append(node)
 
-    def add(self,key, value):
-        self.map[key] = value
-        node = Node(key)
+    def remove(self, key=None):
+        # Without a key, evict the least recently used entry.
+        if key is None:
+            node = self.head.next
+            if node is self.last:
+                return None
+            del self.map[node.key]
+        else:
+            node = self.map.pop(key)
+        self.weight -= node.weight
+        self._unlink(node)
+        return node
+
+    def sweep(self, max_work):
+        # Resume from where the last sweep stopped and look at no more than
+        # max_work entries, removing those that have expired.
+        removed = 0
+        if not self.map:
+            return removed
+        now = self.clock()
+        node = self._cursor or self.head.next
+        nextNode = node
+        for _ in range(min(max_work, len(self.map))):
+            if node is self.last:
+                node = self.head.next
+            nextNode = node.next
+            if node.expires_at is not None and node.expires_at <= now:
+                self.remove(node.key)
+                removed += 1
+                if not self.map:
+                    nextNode = None
+                    break
+            node = nextNode
+        self._cursor = nextNode
+        return removed
+
+    def _live(self, key):
+        node = self.map.get(key)
+        if node is not None and node.expires_at is not None and node.expires_at <= self.clock():
+            self.remove(key)
+            return None
+        return node
+
+    def _append(self, node):
         prevNode = self.last.prev
         prevNode.next = node
-        node.next = self.last
         node.prev = prevNode
+        node.next = self.last
         self.last.prev = node
 
-    def remove(self, key=None):
-        if key:
-        #     find the key
-            node = self.head
-            self.map.pop(key)
-            while(node.next):
-                if node.key == key:
-                    break
-                node = node.next
-            node.prev.next =node.next
-            node.next.prev =node.prev
-            node.prev = None
-            node.next = None
-
-        else:
-            node = self.head.next
-            self.map.pop(node.key)
-            self.head.next = node.next
-            node.next.prev = self.head
-            node.prev = None
-            node.next = None
-
-
-
-
+    def _unlink(self, node):
+        if node is self._cursor:
+            self._cursor = node.next
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = None
+        node.next = None
 
 
 if __name__ == '__main__':
-    s =LRUCache(5)
+    s =LRUCache(5, debug=True)
     s.put(1,'abc')
     s.put(2, 'adad')
     s.put(3, 'asadad')
@@ -106,6 +193,12 @@ if __name__ == '__main__':
     print(s.get(5))
     s.put(1,'asdada')
 
-
-
-
+    # Size-aware, expiring cache: at most 10 bytes of values, entries live for 1 second
+    sized = LRUCache(None, weigher=lambda key, value: len(value), max_weight=10, ttl=1.0)
+    sized.put('a', 'xxxx')
+    sized.put('b', 'yyyy')
+    sized.put('c', 'zzzz')            # evicts 'a' to stay within 10 bytes
+    sized.put('d', 'w', ttl=0.05)
+    print(sized.get('a'), sized.get('b'), sized.weight)
+    time.sleep(0.1)
+    print(sized.get('d'), len(sized))
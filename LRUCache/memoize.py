@@ -0,0 +1,114 @@
+import functools
+import threading
+from collections import namedtuple
+
+from LRUCache.lru import LRUCache
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "coalesced", "maxsize", "currsize"])
+
+_KWD_MARK = object()
+
+
+def _make_key(args, kwargs, typed):
+    key = args
+    if kwargs:
+        key += (_KWD_MARK,) + tuple(kwargs.items())
+    if typed:
+        key += tuple(type(arg) for arg in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    return key
+
+
+class _PendingCall:
+    # Result slot shared by the thread computing a key and the threads waiting on it.
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def lru_memoize(capacity=128, ttl=None, typed=False):
+    # Memoize into an LRUCache. With typed=True, 3 and 3.0 are cached separately.
+    # Concurrent misses on the same key are coalesced: one caller runs the
+    # function, the rest block until it finishes and share its result (or error).
+    # Errors are not cached.
+    def decorator(func):
+        lock = threading.Lock()
+        pending = {}
+        state = {"cache": LRUCache(capacity, ttl=ttl), "hits": 0, "misses": 0, "coalesced": 0}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs, typed)
+            with lock:
+                cache = state["cache"]
+                if key in cache:
+                    state["hits"] += 1
+                    return cache.get(key)
+                call = pending.get(key)
+                if call is None:
+                    call = pending[key] = _PendingCall()
+                    state["misses"] += 1
+                    leader = True
+                else:
+                    state["coalesced"] += 1
+                    leader = False
+
+            if not leader:
+                return call.wait()
+
+            try:
+                call.result = func(*args, **kwargs)
+            except BaseException as error:
+                call.error = error
+                raise
+            else:
+                with lock:
+                    state["cache"].put(key, call.result)
+                return call.result
+            finally:
+                with lock:
+                    pending.pop(key, None)
+                call.event.set()
+
+        def cache_info():
+            with lock:
+                return CacheInfo(state["hits"], state["misses"], state["coalesced"],
+                                 capacity, len(state["cache"]))
+
+        def cache_clear():
+            with lock:
+                state["cache"] = LRUCache(capacity, ttl=ttl)
+                state["hits"] = state["misses"] = state["coalesced"] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+if __name__ == '__main__':
+    import time
+
+    @lru_memoize(capacity=2, ttl=5)
+    def slow_square(n):
+        print(f"computing {n}")
+        time.sleep(0.2)
+        return n * n
+
+    threads = [threading.Thread(target=slow_square, args=(4,)) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(slow_square(4))
+    print(slow_square.cache_info())
@@ -0,0 +1,216 @@
+from LRUCache.lru import LRUCache
+
+
+# -----------------------------
+# Segmented LRU
+# -----------------------------
+class SegmentedLRUCache:
+    # New keys enter probation; a second hit promotes them to the protected
+    # segment. A one-off scan only churns probation, so the protected working
+    # set survives it. Entries demoted from protected go back to probation's MRU end.
+    def __init__(self, capacity, protected_ratio=0.8):
+        self.capacity = capacity
+        self.protected_capacity = max(1, int(capacity * protected_ratio))
+        self.probation = LRUCache(None)
+        self.protected = LRUCache(None)
+
+    def __len__(self):
+        return len(self.probation) + len(self.protected)
+
+    def __contains__(self, key):
+        return key in self.protected or key in self.probation
+
+    def get(self, key):
+        if key in self.protected:
+            return self.protected.get(key)
+        if key in self.probation:
+            value = self.probation.remove(key).value
+            self._protect(key, value)
+            return value
+        return -1
+
+    def put(self, key, value):
+        if key in self.protected:
+            self.protected.reset(key, value)
+        elif key in self.probation:
+            self.probation.remove(key)
+            self._protect(key, value)
+        else:
+            self.probation.add(key, value)
+            if len(self) > self.capacity:
+                self.evict()
+
+    def victim(self):
+        # Key that the next eviction would remove, or None when empty.
+        for segment in (self.probation, self.protected):
+            if segment.head.next is not segment.last:
+                return segment.head.next.key
+        return None
+
+    def evict(self):
+        return self.probation.remove() or self.protected.remove()
+
+    def _protect(self, key, value):
+        self.protected.add(key, value)
+        if len(self.protected) > self.protected_capacity:
+            demoted = self.protected.remove()
+            self.probation.add(demoted.key, demoted.value)
+
+
+# -----------------------------
+# 2Q (Johnson & Shasha)
+# -----------------------------
+class TwoQueueCache:
+    # a1in: FIFO of first-time keys (hits there do not reorder)
+    # a1out: ghost keys recently evicted from a1in, no values
+    # am: LRU of keys seen again after leaving a1in
+    # A scan only passes through a1in, so am keeps the hot set.
+    def __init__(self, capacity, in_ratio=0.25, out_ratio=0.5):
+        self.capacity = capacity
+        self.in_capacity = max(1, int(capacity * in_ratio))
+        self.out_capacity = max(1, int(capacity * out_ratio))
+        self.a1in = LRUCache(None)
+        self.a1out = LRUCache(None)
+        self.am = LRUCache(None)
+
+    def __len__(self):
+        return len(self.a1in) + len(self.am)
+
+    def __contains__(self, key):
+        return key in self.am or key in self.a1in
+
+    def get(self, key):
+        if key in self.am:
+            return self.am.get(key)
+        node = self.a1in.map.get(key)
+        if node is not None:
+            return node.value
+        return -1
+
+    def put(self, key, value):
+        if key in self.am:
+            self.am.reset(key, value)
+            return
+        node = self.a1in.map.get(key)
+        if node is not None:
+            node.value = value
+            return
+
+        if key in self.a1out:
+            self.a1out.remove(key)
+            self.am.add(key, value)
+        else:
+            self.a1in.add(key, value)
+
+        while len(self) > self.capacity:
+            if len(self.a1in) > self.in_capacity or not self.am:
+                evicted = self.a1in.remove()
+                self.a1out.add(evicted.key, None)
+                if len(self.a1out) > self.out_capacity:
+                    self.a1out.remove()
+            else:
+                self.am.remove()
+
+
+# -----------------------------
+# W-TinyLFU
+# -----------------------------
+# Saturating 4-bit counters are halved in one pass with bytes.translate.
+_HALVE = bytes(i >> 1 for i in range(256))
+_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+
+class CountMinSketch:
+    # Approximate access frequency in depth x width saturating counters.
+    # After sample_size increments every counter is halved so old popularity decays.
+    def __init__(self, capacity, depth=4, max_count=15, sample_factor=10):
+        width = 1
+        while width < max(16, capacity):
+            width <<= 1
+        self.width = width
+        self.mask = width - 1
+        self.depth = min(depth, len(_SEEDS))
+        self.rows = [(row * width, seed) for row, seed in enumerate(_SEEDS[:self.depth])]
+        self.max_count = max_count
+        self.table = bytearray(width * self.depth)
+        self.sample_size = max(1, sample_factor * capacity)
+        self.additions = 0
+
+    def _indexes(self, key):
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        mask = self.mask
+        return [offset + (((h ^ seed) * 0x9E3779B1) >> 17 & mask) for offset, seed in self.rows]
+
+    def increment(self, key):
+        table = self.table
+        max_count = self.max_count
+        for i in self._indexes(key):
+            if table[i] < max_count:
+                table[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.table = bytearray(table.translate(_HALVE))
+            self.additions //= 2
+
+    def estimate(self, key):
+        table = self.table
+        return min([table[i] for i in self._indexes(key)])
+
+
+class WTinyLFUCache:
+    # A small LRU window absorbs new keys; what falls out of the window only
+    # enters the main SLRU if the sketch says it is used more often than the
+    # entry main would evict. One-hit wonders from a scan never get admitted.
+    def __init__(self, capacity, window_ratio=0.01):
+        self.capacity = capacity
+        self.window_capacity = max(1, int(capacity * window_ratio))
+        self.main_capacity = max(1, capacity - self.window_capacity)
+        self.window = LRUCache(None)
+        self.main = SegmentedLRUCache(self.main_capacity)
+        self.sketch = CountMinSketch(capacity)
+
+    def __len__(self):
+        return len(self.window) + len(self.main)
+
+    def __contains__(self, key):
+        return key in self.window or key in self.main
+
+    def get(self, key):
+        self.sketch.increment(key)
+        if key in self.window:
+            return self.window.get(key)
+        return self.main.get(key)
+
+    def put(self, key, value):
+        if key in self.window:
+            self.window.reset(key, value)
+            return
+        if key in self.main:
+            self.main.put(key, value)
+            return
+
+        self.window.add(key, value)
+        if len(self.window) <= self.window_capacity:
+            return
+
+        candidate = self.window.remove()
+        if len(self.main) < self.main_capacity:
+            self.main.put(candidate.key, candidate.value)
+            return
+        victim = self.main.victim()
+        if self.sketch.estimate(candidate.key) > self.sketch.estimate(victim):
+            self.main.evict()
+            self.main.put(candidate.key, candidate.value)
+
+
+if __name__ == '__main__':
+    for cache in (LRUCache(4), SegmentedLRUCache(4), TwoQueueCache(4), WTinyLFUCache(4)):
+        for _ in range(3):
+            for key in ('a', 'b'):
+                if cache.get(key) == -1:
+                    cache.put(key, key.upper())
+        # one-off scan
+        for key in range(10):
+            if cache.get(key) == -1:
+                cache.put(key, key)
+        print(type(cache).__name__, cache.get('a'), cache.get('b'))
@@ -0,0 +1,280 @@
+import multiprocessing
+import struct
+import zlib
+from multiprocessing import shared_memory
+
+# Arena layout (all little-endian, fixed at creation time):
+#
+#   header | index: int32[index_size] | slots: slot[capacity]
+#
+#   header: magic, capacity, key_size, value_size, index_size, head, tail, count, free
+#   index:  open-addressing (linear probing) table of slot numbers, EMPTY when unused
+#   slot:   prev, next, hash, key_len, value_len, key bytes, value bytes
+#
+# Slots form a doubly linked LRU list (head = least recent) threaded through
+# prev/next; free slots are chained through next. Every process maps the same
+# bytes, so a lookup only touches the probed index entries and one slot.
+_MAGIC = b"SHLRU001"
+_HEADER = struct.Struct("<8sIIIIiiIi")
+_META = struct.Struct("<iiIHI")
+_LINKS = struct.Struct("<ii")
+_EMPTY = -1
+_NIL = -1
+
+
+def _to_bytes(key):
+    return key.encode() if isinstance(key, str) else bytes(key)
+
+
+class SharedLRUCache:
+    # Fixed-size-slot LRU cache living in a multiprocessing.shared_memory block.
+    # Keys are str/bytes, values are bytes (callers serialize), each bounded by
+    # key_size / value_size. All operations take the shared lock, because a hit
+    # also moves the slot to the MRU end. Pickling only sends the block name and
+    # the lock, so the cache can be handed to worker processes.
+    def __init__(self, capacity=1024, key_size=64, value_size=256, name=None, lock=None, create=True):
+        if create:
+            index_size = 1
+            while index_size < 2 * capacity:
+                index_size <<= 1
+            stride = _META.size + key_size + value_size
+            size = _HEADER.size + 4 * index_size + stride * capacity
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _HEADER.pack_into(self._shm.buf, 0, _MAGIC, capacity, key_size, value_size,
+                              index_size, _NIL, _NIL, 0, 0 if capacity else _NIL)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        self._map()
+        if create:
+            index = self._index
+            for i in range(self.index_size):
+                index[i] = _EMPTY
+            for slot in range(self.capacity):
+                self._set_links(slot, _NIL, slot + 1 if slot + 1 < self.capacity else _NIL)
+
+    @classmethod
+    def attach(cls, name, lock):
+        return cls(name=name, lock=lock, create=False)
+
+    def _map(self):
+        buf = self._shm.buf
+        magic, capacity, key_size, value_size, index_size, _, _, _, _ = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self._shm.name} is not a SharedLRUCache block")
+        self.capacity = capacity
+        self.key_size = key_size
+        self.value_size = value_size
+        self.index_size = index_size
+        self._mask = index_size - 1
+        self._stride = _META.size + key_size + value_size
+        self._slots_offset = _HEADER.size + 4 * index_size
+        self._buf = buf
+        self._index = buf[_HEADER.size:self._slots_offset].cast("i")
+
+    def __getstate__(self):
+        return {"name": self._shm.name, "lock": self.lock}
+
+    def __setstate__(self, state):
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self.lock = state["lock"]
+        self._map()
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def close(self):
+        self._index.release()
+        self._index = None
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+    # ---- header fields ----
+    def _header(self):
+        return _HEADER.unpack_from(self._buf, 0)[5:]
+
+    def _set_header(self, head, tail, count, free):
+        struct.pack_into("<iiIi", self._buf, 24, head, tail, count, free)
+
+    # ---- slot access ----
+    def _slot_offset(self, slot):
+        return self._slots_offset + slot * self._stride
+
+    def _links(self, slot):
+        return _LINKS.unpack_from(self._buf, self._slot_offset(slot))
+
+    def _set_links(self, slot, prev, next):
+        _LINKS.pack_into(self._buf, self._slot_offset(slot), prev, next)
+
+    def _slot_hash(self, slot):
+        return _META.unpack_from(self._buf, self._slot_offset(slot))[2]
+
+    def _slot_key(self, slot):
+        offset = self._slot_offset(slot)
+        key_len = _META.unpack_from(self._buf, offset)[3]
+        start = offset + _META.size
+        return bytes(self._buf[start:start + key_len])
+
+    def _slot_value(self, slot):
+        offset = self._slot_offset(slot)
+        value_len = _META.unpack_from(self._buf, offset)[4]
+        start = offset + _META.size + self.key_size
+        return bytes(self._buf[start:start + value_len])
+
+    def _write_slot(self, slot, prev, next, h, key, value):
+        offset = self._slot_offset(slot)
+        _META.pack_into(self._buf, offset, prev, next, h, len(key), len(value))
+        start = offset + _META.size
+        self._buf[start:start + len(key)] = key
+        start += self.key_size
+        self._buf[start:start + len(value)] = value
+
+    def _write_value(self, slot, value):
+        offset = self._slot_offset(slot)
+        struct.pack_into("<I", self._buf, offset + 14, len(value))
+        start = offset + _META.size + self.key_size
+        self._buf[start:start + len(value)] = value
+
+    # ---- index ----
+    def _find(self, key, h):
+        # Returns (index position, slot); slot is _EMPTY when the key is absent
+        # and position is then where it would be inserted.
+        index, mask = self._index, self._mask
+        i = h & mask
+        while True:
+            slot = index[i]
+            if slot == _EMPTY or (self._slot_hash(slot) == h and self._slot_key(slot) == key):
+                return i, slot
+            i = (i + 1) & mask
+
+    def _index_delete(self, i):
+        # Backward-shift deletion keeps probe chains intact without tombstones.
+        index, mask = self._index, self._mask
+        j = i
+        while True:
+            j = (j + 1) & mask
+            slot = index[j]
+            if slot == _EMPTY:
+                break
+            home = self._slot_hash(slot) & mask
+            if (i <= j and (home <= i or home > j)) or (i > j and home <= i and home > j):
+                index[i] = slot
+                i = j
+        index[i] = _EMPTY
+
+    # ---- LRU list ----
+    def _unlink(self, slot, head, tail):
+        prev, next = self._links(slot)
+        if prev == _NIL:
+            head = next
+        else:
+            self._set_links(prev, self._links(prev)[0], next)
+        if next == _NIL:
+            tail = prev
+        else:
+            self._set_links(next, prev, self._links(next)[1])
+        return head, tail
+
+    def _append(self, slot, head, tail):
+        self._set_links(slot, tail, _NIL)
+        if tail == _NIL:
+            head = slot
+        else:
+            self._set_links(tail, self._links(tail)[0], slot)
+        return head, slot
+
+    # ---- public API ----
+    def __len__(self):
+        with self.lock:
+            return self._header()[2]
+
+    def __contains__(self, key):
+        key = _to_bytes(key)
+        with self.lock:
+            return self._find(key, zlib.crc32(key))[1] != _EMPTY
+
+    def get(self, key):
+        key = _to_bytes(key)
+        h = zlib.crc32(key)
+        with self.lock:
+            _, slot = self._find(key, h)
+            if slot == _EMPTY:
+                return -1
+            head, tail, count, free = self._header()
+            if slot != tail:
+                head, tail = self._unlink(slot, head, tail)
+                head, tail = self._append(slot, head, tail)
+                self._set_header(head, tail, count, free)
+            return self._slot_value(slot)
+
+    def put(self, key, value):
+        key = _to_bytes(key)
+        value = bytes(value)
+        if len(key) > self.key_size or len(value) > self.value_size:
+            raise ValueError(f"key/value exceed slot size ({self.key_size}/{self.value_size} bytes)")
+        h = zlib.crc32(key)
+        with self.lock:
+            head, tail, count, free = self._header()
+            i, slot = self._find(key, h)
+            if slot != _EMPTY:
+                self._write_value(slot, value)
+                if slot != tail:
+                    head, tail = self._unlink(slot, head, tail)
+                    head, tail = self._append(slot, head, tail)
+                self._set_header(head, tail, count, free)
+                return
+
+            if count == self.capacity:
+                victim = head
+                head, tail = self._unlink(victim, head, tail)
+                self._index_delete(self._find(self._slot_key(victim), self._slot_hash(victim))[0])
+                self._set_links(victim, _NIL, free)
+                free = victim
+                count -= 1
+                i, _ = self._find(key, h)
+
+            slot = free
+            free = self._links(slot)[1]
+            self._write_slot(slot, _NIL, _NIL, h, key, value)
+            head, tail = self._append(slot, head, tail)
+            self._index[i] = slot
+            self._set_header(head, tail, count + 1, free)
+
+    def remove(self, key):
+        key = _to_bytes(key)
+        with self.lock:
+            i, slot = self._find(key, zlib.crc32(key))
+            if slot == _EMPTY:
+                return False
+            head, tail, count, free = self._header()
+            head, tail = self._unlink(slot, head, tail)
+            self._index_delete(i)
+            self._set_links(slot, _NIL, free)
+            self._set_header(head, tail, count - 1, slot)
+            return True
+
+
+def _worker(cache, results):
+    results.put((cache.get("a"), cache.get("missing")))
+    cache.put("from-child", b"hello")
+    cache.close()
+
+
+if __name__ == '__main__':
+    cache = SharedLRUCache(capacity=2, key_size=16, value_size=16)
+    try:
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        results = multiprocessing.Queue()
+        child = multiprocessing.Process(target=_worker, args=(cache, results))
+        child.start()
+        print(results.get())
+        child.join()
+        print(cache.get("from-child"), cache.get("b"), cache.get("a"), len(cache))
+    finally:
+        cache.close()
+        cache.unlink()
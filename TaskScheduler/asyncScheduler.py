@@ -0,0 +1,166 @@
+import asyncio
+import inspect
+import itertools
+import time
+from collections import defaultdict
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from TaskScheduler.taskscheduler import HeapTimerQueue, HierarchicalTimingWheel, IndexedHeap, Task, TaskState
+
+
+# -----------------------------
+# asyncio Scheduler
+# -----------------------------
+class AsyncTaskScheduler:
+    # asyncio front end with the same (priority_id, task_id, execution_time)
+    # semantics as TaskScheduler: tasks wait until execution_time, then are handed
+    # out lowest priority_id first, ties broken by execution_time and insertion order.
+    #
+    #   async for task in scheduler.due_tasks(): ...   # consume due tasks yourself
+    #   await scheduler.run()                          # or let the scheduler await task.func
+    #
+    # run() honours per-priority concurrency limits (limits={priority: n},
+    # default_limit for the rest) without letting a saturated priority block others.
+    # cancel() drops a pending task, or cancels the running coroutine at its next await.
+    def __init__(self, limits: Optional[Dict[int, int]] = None, default_limit: Optional[int] = None,
+                 clock: Callable[[], float] = time.time, timer: str = "heap", tick: float = 0.001):
+        if timer not in ("heap", "wheel"):
+            raise ValueError("timer must be 'heap' or 'wheel'")
+        self.clock = clock
+        self.waiting = HierarchicalTimingWheel(tick, start=clock()) if timer == "wheel" else HeapTimerQueue()
+        self.ready: Dict[int, IndexedHeap] = {}
+        self.tasks: Dict[object, Task] = {}
+        self.counter = itertools.count()
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.running: Dict[int, int] = defaultdict(int)
+        self.closed = False
+        self._wakeup = asyncio.Event()
+
+    # ---- queue operations ----
+    async def add_task(self, priority_id: int, task_id, execution_time: float,
+                       func: Optional[Callable] = None, *args, **kwargs) -> Task:
+        if task_id in self.tasks:
+            raise ValueError(f"Task {task_id} already scheduled")
+        task = Task(priority_id, task_id, execution_time, next(self.counter), func, args, kwargs)
+        task.scheduler = self
+        self.tasks[task_id] = task
+        if execution_time <= self.clock():
+            self._push_ready(task)
+        else:
+            self.waiting.add(task)
+        self._wakeup.set()
+        return task
+
+    def cancel(self, task_id) -> bool:
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return False
+        if task.state == TaskState.RUNNING:
+            task.future.cancel()
+        elif task.due:
+            self.ready[task.priority].remove(task)
+        else:
+            self.waiting.remove(task)
+        task.state = TaskState.CANCELLED
+        self._wakeup.set()
+        return True
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def _push_ready(self, task: Task):
+        task.due = True
+        heap = self.ready.get(task.priority)
+        if heap is None:
+            heap = self.ready[task.priority] = IndexedHeap(Task.sort_key)
+        heap.push(task)
+
+    def _has_capacity(self, priority: int) -> bool:
+        limit = self.limits.get(priority, self.default_limit)
+        return limit is None or self.running[priority] < limit
+
+    def _pop_ready(self, limited: bool) -> Optional[Task]:
+        for task in self.waiting.pop_due(self.clock()):
+            self._push_ready(task)
+        for priority in sorted(self.ready):
+            heap = self.ready[priority]
+            if heap and (not limited or self._has_capacity(priority)):
+                task = heap.pop()
+                if not heap:
+                    del self.ready[priority]
+                return task
+        return None
+
+    async def _wait_for_work(self):
+        deadline = self.waiting.next_deadline()
+        timeout = None if deadline is None else max(0.0, deadline - self.clock())
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    # ---- consumers ----
+    async def due_tasks(self) -> AsyncIterator[Task]:
+        while not self.closed:
+            task = self._pop_ready(limited=False)
+            if task is None:
+                await self._wait_for_work()
+                continue
+            del self.tasks[task.task_id]
+            task.state = TaskState.RUNNING
+            yield task
+
+    async def run(self):
+        while not self.closed:
+            task = self._pop_ready(limited=True)
+            if task is None:
+                await self._wait_for_work()
+                continue
+            self.running[task.priority] += 1
+            task.state = TaskState.RUNNING
+            task.future = asyncio.ensure_future(self._execute(task))
+            # Bookkeeping runs as a done callback: a task cancelled before its
+            # first step never enters _execute, but its callback still fires.
+            task.future.add_done_callback(lambda future, task=task: self._finished(task))
+
+    async def _execute(self, task: Task):
+        if task.func is not None:
+            result = task.func(*task.args, **task.kwargs)
+            if inspect.isawaitable(result):
+                await result
+
+    def _finished(self, task: Task):
+        self.running[task.priority] -= 1
+        self.tasks.pop(task.task_id, None)
+        if task.state == TaskState.RUNNING:
+            task.state = TaskState.DONE
+        self._wakeup.set()
+
+    def close(self):
+        self.closed = True
+        self._wakeup.set()
+
+
+if __name__ == '__main__':
+    async def job(name, seconds):
+        print(f"start {name}")
+        await asyncio.sleep(seconds)
+        print(f"done {name}")
+
+    async def main():
+        scheduler = AsyncTaskScheduler(limits={1: 1})
+        runner = asyncio.ensure_future(scheduler.run())
+        now = time.time()
+        await scheduler.add_task(1, "report-1", now, job, "report-1", 0.2)
+        await scheduler.add_task(1, "report-2", now, job, "report-2", 0.2)  # waits: priority 1 limit is 1
+        await scheduler.add_task(0, "alert", now + 0.1, job, "alert", 0.05)
+        slow = await scheduler.add_task(0, "slow", now, job, "slow", 5)
+        await asyncio.sleep(0.3)
+        slow.cancel()                                                      # cancelled at its await
+        await asyncio.sleep(0.3)
+        scheduler.close()
+        await runner
+
+    asyncio.run(main())
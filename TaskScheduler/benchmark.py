@@ -0,0 +1,77 @@
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from TaskScheduler.durableQueue import DurableTaskScheduler
+from TaskScheduler.taskscheduler import HeapTimerQueue, HierarchicalTimingWheel, Task
+
+
+# -----------------------------
+# Timer backends: schedule / cancel / fire
+# -----------------------------
+def _cycle(timer, tasks, cancelled, horizon, step):
+    start = time.perf_counter()
+    for task in tasks:
+        timer.add(task)
+    scheduled = time.perf_counter()
+    for task in cancelled:
+        timer.remove(task)
+    cancelled_at = time.perf_counter()
+    fired = 0
+    now = 0.0
+    while now <= horizon + step:
+        now += step
+        fired += len(timer.pop_due(now))
+    done = time.perf_counter()
+    return scheduled - start, cancelled_at - scheduled, done - cancelled_at, fired
+
+
+def bench_timers(n=1_000_000, horizon=60.0, cancel_ratio=0.5, tick=0.001, step=0.01):
+    # n short-lived timeouts spread over `horizon` seconds of simulated time; a
+    # share of them are cancelled, the rest are fired by advancing the clock in
+    # `step` increments the way the dispatcher would.
+    rnd = random.Random(17)
+    times = [rnd.uniform(0, horizon) for _ in range(n)]
+    print(f"{'backend':>8} {'schedule/s':>14} {'cancel/s':>14} {'fire/s':>14} {'fired':>10}")
+    for name, make in (("heap", HeapTimerQueue), ("wheel", lambda: HierarchicalTimingWheel(tick))):
+        tasks = [Task(0, i, t, i) for i, t in enumerate(times)]
+        cancelled = rnd.sample(tasks, int(n * cancel_ratio))
+        schedule, cancel, fire, fired = _cycle(make(), tasks, cancelled, horizon, step)
+        print(f"{name:>8} {n / schedule:>14,.0f} {len(cancelled) / cancel:>14,.0f} "
+              f"{fired / fire:>14,.0f} {fired:>10}")
+
+
+# -----------------------------
+# Durable enqueue throughput per fsync policy
+# -----------------------------
+def _enqueue(scheduler, thread_id, count):
+    for i in range(count):
+        scheduler.add_task(i % 4, f"{thread_id}-{i}", 1e12)
+
+
+def bench_durable(policies=("never", "batch", "always"), thread_counts=(1, 8), tasks_per_thread=2_000):
+    print(f"{'fsync':>8} {'threads':>8} {'enqueue/s':>12}")
+    for policy in policies:
+        for threads in thread_counts:
+            directory = tempfile.mkdtemp()
+            try:
+                scheduler = DurableTaskScheduler(directory, fsync=policy)
+                workers = [threading.Thread(target=_enqueue, args=(scheduler, n, tasks_per_thread))
+                           for n in range(threads)]
+                start = time.perf_counter()
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+                elapsed = time.perf_counter() - start
+                scheduler.close()
+                print(f"{policy:>8} {threads:>8} {threads * tasks_per_thread / elapsed:>12,.0f}")
+            finally:
+                shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    bench_timers()
+    bench_durable()
@@ -0,0 +1,237 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+
+# -----------------------------
+# DAG Task
+# -----------------------------
+class DagTaskState(Enum):
+    PENDING = 1
+    RUNNING = 2
+    DONE = 3
+    FAILED = 4
+    SKIPPED = 5
+
+
+class DagTask:
+    __slots__ = ('task_id', 'func', 'args', 'kwargs', 'depends_on', 'dependents', 'remaining',
+                 'state', 'result', 'error', 'started', 'finished', 'worker')
+
+    def __init__(self, task_id, func: Optional[Callable], args, kwargs, depends_on):
+        self.task_id = task_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.depends_on = list(depends_on)
+        self.dependents: List['DagTask'] = []
+        self.remaining = 0
+        self.state = DagTaskState.PENDING
+        self.result = None
+        self.error = None
+        self.started = 0.0
+        self.finished = 0.0
+        self.worker = -1
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+    def __repr__(self):
+        return f"DagTask({self.task_id}, {self.state.name})"
+
+
+class DagReport:
+    def __init__(self, makespan: float, critical_path: list, critical_path_time: float,
+                 utilization: Dict[int, float], steals: Dict[int, int], failed: list, skipped: list):
+        self.makespan = makespan
+        self.critical_path = critical_path
+        self.critical_path_time = critical_path_time
+        self.utilization = utilization
+        self.steals = steals
+        self.failed = failed
+        self.skipped = skipped
+
+    def __repr__(self):
+        return (f"DagReport(makespan={self.makespan:.3f}s, critical_path={self.critical_path}, "
+                f"critical_path_time={self.critical_path_time:.3f}s, utilization={self.utilization}, "
+                f"steals={self.steals}, failed={self.failed}, skipped={self.skipped})")
+
+
+# -----------------------------
+# Work-stealing DAG scheduler
+# -----------------------------
+class DagScheduler:
+    # Runs a DAG of tasks on `workers` threads. Each worker owns a deque: it
+    # pushes tasks it unblocks onto its own end and pops from there (LIFO, keeps
+    # dependent work on the same thread), and when empty steals from the far end
+    # of another worker's deque, so short tasks never queue behind one busy worker.
+    # A failed task marks everything downstream of it as SKIPPED.
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+        self.tasks: Dict[object, DagTask] = {}
+
+    def add_task(self, task_id, func: Optional[Callable] = None, *args, depends_on=(), **kwargs) -> DagTask:
+        if task_id in self.tasks:
+            raise ValueError(f"Task {task_id} already added")
+        task = DagTask(task_id, func, args, kwargs, depends_on)
+        self.tasks[task_id] = task
+        return task
+
+    def topological_order(self) -> List[DagTask]:
+        indegree = {}
+        for task in self.tasks.values():
+            task.dependents = []
+        for task in self.tasks.values():
+            for dep in task.depends_on:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task {task.task_id} depends on unknown task {dep}")
+                self.tasks[dep].dependents.append(task)
+            indegree[task.task_id] = len(task.depends_on)
+
+        order = []
+        queue = deque(task for task in self.tasks.values() if not task.depends_on)
+        while queue:
+            task = queue.popleft()
+            order.append(task)
+            for child in task.dependents:
+                indegree[child.task_id] -= 1
+                if indegree[child.task_id] == 0:
+                    queue.append(child)
+        if len(order) != len(self.tasks):
+            raise ValueError("Task dependencies contain a cycle")
+        return order
+
+    def run(self) -> DagReport:
+        order = self.topological_order()
+        self.deques = [deque() for _ in range(self.workers)]
+        self.condition = threading.Condition()
+        self.completed = 0
+        self.busy = [0.0] * self.workers
+        self.steals = [0] * self.workers
+
+        for task in order:
+            task.remaining = len(task.depends_on)
+            task.state = DagTaskState.PENDING
+        for i, task in enumerate(t for t in order if not t.remaining):
+            self.deques[i % self.workers].append(task)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._work, args=(wid,), name=f"dag-worker-{wid}")
+                   for wid in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        makespan = time.perf_counter() - start
+
+        critical_path, critical_time = self._critical_path(order)
+        return DagReport(
+            makespan=makespan,
+            critical_path=critical_path,
+            critical_path_time=critical_time,
+            utilization={wid: (self.busy[wid] / makespan if makespan else 0.0) for wid in range(self.workers)},
+            steals=dict(enumerate(self.steals)),
+            failed=[t.task_id for t in order if t.state == DagTaskState.FAILED],
+            skipped=[t.task_id for t in order if t.state == DagTaskState.SKIPPED],
+        )
+
+    def _next(self, wid: int) -> Optional[DagTask]:
+        try:
+            return self.deques[wid].pop()
+        except IndexError:
+            pass
+        for offset in range(1, self.workers):
+            victim = self.deques[(wid + offset) % self.workers]
+            try:
+                task = victim.popleft()
+            except IndexError:
+                continue
+            self.steals[wid] += 1
+            return task
+        return None
+
+    def _work(self, wid: int):
+        total = len(self.tasks)
+        own = self.deques[wid]
+        while True:
+            task = self._next(wid)
+            if task is None:
+                with self.condition:
+                    while self.completed < total and not any(self.deques):
+                        self.condition.wait()
+                    if self.completed >= total:
+                        return
+                continue
+
+            task.state = DagTaskState.RUNNING
+            task.worker = wid
+            task.started = time.perf_counter()
+            try:
+                if task.func is not None:
+                    task.result = task.func(*task.args, **task.kwargs)
+                task.state = DagTaskState.DONE
+            except BaseException as error:  # SystemExit & co. too: a dead worker would hang the others
+                task.error = error
+                task.state = DagTaskState.FAILED
+            task.finished = time.perf_counter()
+            self.busy[wid] += task.duration
+
+            with self.condition:
+                self.completed += 1
+                if task.state == DagTaskState.FAILED:
+                    self.completed += self._skip_dependents(task)
+                else:
+                    for child in task.dependents:
+                        child.remaining -= 1
+                        if child.remaining == 0 and child.state == DagTaskState.PENDING:
+                            own.append(child)
+                self.condition.notify_all()
+
+    def _skip_dependents(self, task: DagTask) -> int:
+        skipped = 0
+        stack = list(task.dependents)
+        while stack:
+            child = stack.pop()
+            if child.state != DagTaskState.PENDING:
+                continue
+            child.state = DagTaskState.SKIPPED
+            skipped += 1
+            stack.extend(child.dependents)
+        return skipped
+
+    @staticmethod
+    def _critical_path(order: List[DagTask]):
+        # Longest chain of measured task durations through the DAG.
+        best: Dict[object, float] = {}
+        via: Dict[object, object] = {}
+        for task in order:
+            ran = task.state in (DagTaskState.DONE, DagTaskState.FAILED)
+            own = task.duration if ran else 0.0
+            parent = max(task.depends_on, key=lambda dep: best[dep], default=None)
+            best[task.task_id] = own + (best[parent] if parent is not None else 0.0)
+            via[task.task_id] = parent
+        if not best:
+            return [], 0.0
+        end = max(best, key=best.get)
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = via[node]
+        return path[::-1], best[end]
+
+
+if __name__ == '__main__':
+    scheduler = DagScheduler(workers=3)
+    scheduler.add_task("A", time.sleep, 0.1)
+    scheduler.add_task("C", time.sleep, 0.05)
+    scheduler.add_task("B", time.sleep, 0.1, depends_on=("A", "C"))
+    for i in range(12):
+        scheduler.add_task(f"short-{i}", time.sleep, 0.01, depends_on=("C",))
+    scheduler.add_task("D", time.sleep, 0.02, depends_on=("B",))
+    scheduler.add_task("bad", int, "not a number", depends_on=("C",))
+    scheduler.add_task("after-bad", print, "never printed", depends_on=("bad",))
+    print(scheduler.run())
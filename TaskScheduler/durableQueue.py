@@ -0,0 +1,316 @@
+import importlib
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+from TaskScheduler.taskscheduler import Task, TaskScheduler
+
+ENQUEUE = 1
+DEQUEUE = 2
+
+# record: payload length, crc32 of (type + payload), type, payload (JSON)
+_RECORD = struct.Struct("<IIB")
+
+
+# -----------------------------
+# Write-ahead log
+# -----------------------------
+class WriteAheadLog:
+    # Append-only log split into numbered segment files (wal-00000001.log, ...).
+    #
+    # fsync policy:
+    #   "always" - every commit() fsyncs on its own
+    #   "batch"  - group commit: one committer fsyncs everything written so far
+    #              while the others wait for it, so N concurrent commits cost ~1 fsync
+    #   "never"  - leave flushing to the OS (fast, loses the tail on power failure)
+    def __init__(self, directory: str, fsync: str = "batch", segment_size: int = 64 * 1024 * 1024):
+        if fsync not in ("always", "batch", "never"):
+            raise ValueError("fsync must be 'always', 'batch' or 'never'")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fsync = fsync
+        self.segment_size = segment_size
+        self.lock = threading.Lock()
+        self.sync_condition = threading.Condition()
+        self.written = 0
+        self.synced = 0
+        self.syncing = False
+        segments = self.segments()
+        self.segment = (segments[-1] if segments else 0) + 1
+        self.file = open(self._segment_path(self.segment), "ab")
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"wal-{number:08d}.log")
+
+    def segments(self):
+        return sorted(int(name[4:12]) for name in os.listdir(self.directory)
+                      if name.startswith("wal-") and name.endswith(".log"))
+
+    def append(self, record_type: int, payload: dict) -> int:
+        # Buffered write; returns the record's sequence number for commit().
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        header = _RECORD.pack(len(body), zlib.crc32(bytes([record_type]) + body), record_type)
+        with self.lock:
+            self.file.write(header + body)
+            self.written += 1
+            if self.file.tell() >= self.segment_size:
+                self._rotate()
+            return self.written
+
+    def commit(self, seq: Optional[int] = None):
+        # Block until record `seq` (default: everything appended so far) is durable.
+        if self.fsync == "never":
+            with self.lock:
+                self.file.flush()
+            return
+        if seq is None:
+            seq = self.written
+        if self.fsync == "always":
+            with self.lock:
+                if self.synced < seq:
+                    self.file.flush()
+                    os.fsync(self.file.fileno())
+                    self.synced = self.written
+            return
+
+        with self.sync_condition:
+            while self.synced < seq:
+                if self.syncing:
+                    self.sync_condition.wait()
+                    continue
+                self.syncing = True
+                self.sync_condition.release()
+                try:
+                    with self.lock:
+                        self.file.flush()
+                        target = self.written
+                        fd = os.dup(self.file.fileno())
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                finally:
+                    self.sync_condition.acquire()
+                    self.syncing = False
+                self.synced = max(self.synced, target)
+                self.sync_condition.notify_all()
+
+    def rotate(self) -> int:
+        # Start a new segment; returns its number. Records before it are in older segments.
+        with self.lock:
+            self._rotate()
+            return self.segment
+
+    def _rotate(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        self.segment += 1
+        self.file = open(self._segment_path(self.segment), "ab")
+
+    def drop_before(self, segment: int):
+        for number in self.segments():
+            if number < segment:
+                os.remove(self._segment_path(number))
+
+    def replay(self, from_segment: int = 0) -> Iterator[Tuple[int, dict]]:
+        # Yields (type, payload) in order; a torn or corrupt record ends its segment.
+        for number in self.segments():
+            if number < from_segment or number == self.segment:
+                continue
+            with open(self._segment_path(number), "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset + _RECORD.size <= len(data):
+                length, crc, record_type = _RECORD.unpack_from(data, offset)
+                start = offset + _RECORD.size
+                body = data[start:start + length]
+                if len(body) < length or zlib.crc32(bytes([record_type]) + body) != crc:
+                    break
+                yield record_type, json.loads(body)
+                offset = start + length
+
+    def close(self):
+        with self.lock:
+            self.file.flush()
+            if self.fsync != "never":
+                os.fsync(self.file.fileno())
+            self.file.close()
+
+
+# -----------------------------
+# Durable scheduler
+# -----------------------------
+def _func_path(func) -> Optional[str]:
+    # "module:qualname" for a function that _resolve() finds again; raises
+    # ValueError for lambdas, closures, bound methods and the like.
+    if func is None:
+        return None
+    module, qualname = getattr(func, "__module__", None), getattr(func, "__qualname__", "")
+    if module and "<" not in qualname:
+        path = f"{module}:{qualname}"
+        try:
+            if _resolve(path) is func:
+                return path
+        except (ImportError, AttributeError):
+            pass
+    raise ValueError(f"func {func!r} cannot be stored: it must be an importable module-level function")
+
+
+def _resolve(path: Optional[str]):
+    if path is None:
+        return None
+    module, qualname = path.split(":")
+    target = importlib.import_module(module)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+class DurableTaskScheduler(TaskScheduler):
+    # TaskScheduler whose pending set survives restarts. Every enqueue and
+    # dequeue (pop, dispatch, cancel) is appended to a WriteAheadLog while the
+    # scheduler lock is held, so log order matches queue order; add_task()
+    # returns only once its record is durable under the chosen fsync policy.
+    # Dequeues are committed the same way before a task is handed out
+    # (pop_next_task() returning, or the dispatcher submitting it), so delivery
+    # is at-most-once: a crash after the commit loses that task instead of
+    # replaying one that may already have run.
+    # Every `checkpoint_every` records the pending set is written to a
+    # checkpoint and older segments are dropped, bounding replay time.
+    #
+    # task_id, args and kwargs must be JSON-serializable and func must be an
+    # importable module-level function (stored as "module:qualname");
+    # add_task() raises ValueError otherwise, before anything is scheduled.
+    def __init__(self, directory: str, fsync: str = "batch", checkpoint_every: int = 10_000,
+                 segment_size: int = 64 * 1024 * 1024, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.wal = WriteAheadLog(directory, fsync, segment_size)
+        self._since_checkpoint = 0
+        self._recovering = True
+        self._recover()
+        self._recovering = False
+
+    def add_task(self, priority_id: int, task_id, execution_time: float, func=None, *args, **kwargs) -> Task:
+        record = {"task_id": task_id, "priority": priority_id, "execution_time": execution_time,
+                  "func": _func_path(func), "args": list(args), "kwargs": kwargs}
+        try:
+            json.dumps(record)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"Task {task_id} cannot be stored: {error}") from None
+        task = super().add_task(priority_id, task_id, execution_time, func, *args, **kwargs)
+        self.wal.commit()
+        return task
+
+    def cancel(self, task_id) -> bool:
+        cancelled = super().cancel(task_id)
+        if cancelled:
+            self.wal.commit()
+        return cancelled
+
+    def pop_next_task(self) -> Optional[Task]:
+        task = super().pop_next_task()
+        if task is not None:
+            self.wal.commit()
+        return task
+
+    def _submit(self, task: Task):
+        self.wal.commit()
+        super()._submit(task)
+
+    def _on_enqueue(self, task: Task):
+        if self._recovering:
+            return
+        self.wal.append(ENQUEUE, self._encode(task))
+        self._maybe_checkpoint()
+
+    def _on_dequeue(self, task: Task):
+        if self._recovering:
+            return
+        self.wal.append(DEQUEUE, {"task_id": task.task_id})
+        self._maybe_checkpoint()
+
+    @staticmethod
+    def _encode(task: Task) -> dict:
+        return {"task_id": task.task_id, "priority": task.priority, "execution_time": task.execution_time,
+                "func": _func_path(task.func), "args": list(task.args), "kwargs": task.kwargs}
+
+    def _maybe_checkpoint(self):
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        with self.condition:
+            segment = self.wal.rotate()
+            pending = sorted(self.tasks.values(), key=lambda task: task.seq)
+            path = os.path.join(self.directory, f"checkpoint-{segment:08d}.json")
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"segment": segment, "tasks": [self._encode(task) for task in pending]}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            self._since_checkpoint = 0
+            for name in os.listdir(self.directory):
+                if name.startswith("checkpoint-") and name.endswith(".json") and name != os.path.basename(path):
+                    os.remove(os.path.join(self.directory, name))
+            self.wal.drop_before(segment)
+
+    def _recover(self):
+        pending: Dict[object, dict] = {}
+        from_segment = 0
+        checkpoints = sorted(name for name in os.listdir(self.directory)
+                             if name.startswith("checkpoint-") and name.endswith(".json"))
+        if checkpoints:
+            with open(os.path.join(self.directory, checkpoints[-1])) as f:
+                state = json.load(f)
+            from_segment = state["segment"]
+            pending = {record["task_id"]: record for record in state["tasks"]}
+
+        replayed = 0
+        for record_type, record in self.wal.replay(from_segment):
+            replayed += 1
+            if record_type == ENQUEUE:
+                pending[record["task_id"]] = record
+            else:
+                pending.pop(record["task_id"], None)
+
+        for record in pending.values():
+            super().add_task(record["priority"], record["task_id"], record["execution_time"],
+                             _resolve(record["func"]), *record["args"], **record["kwargs"])
+        if replayed:
+            self.checkpoint()
+
+    def close(self):
+        self.shutdown()
+        self.wal.close()
+
+
+if __name__ == '__main__':
+    import shutil
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+    try:
+        scheduler = DurableTaskScheduler(directory)
+        scheduler.add_task(2, "A", 5)
+        scheduler.add_task(1, "B", 10)
+        scheduler.add_task(1, "C", 3, print, "hello from C")
+        scheduler.cancel("A")
+        scheduler.close()
+
+        # "restart": the pending tasks are rebuilt from the log
+        recovered = DurableTaskScheduler(directory)
+        for t in recovered.get_all_tasks():
+            print(t)
+        task = recovered.pop_next_task()
+        task.func(*task.args)
+        recovered.close()
+    finally:
+        shutil.rmtree(directory)
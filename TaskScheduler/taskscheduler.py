@@ -1,52 +1,477 @@
-import heapq
-
-# class TaskScheduler:
-#     def __init__(self):
-#         self.heap = []
-#         self.counter = 0  # to preserve insertion order
-#
-#     def add_task(self, priority_id, task_id, execution_time):
-#         # push a tuple with all sorting priorities
-#         heapq.heappush(self.heap, (priority_id, execution_time, self.counter, task_id))
-#         self.counter += 1
-#
-#     def get_all_tasks(self):
-#         # heapq doesn’t have sorted order by default, so just return in sorted order view
-#         # (heap itself is partially sorted, extraction will be O(n log n), but we can snapshot efficiently)
-#         sorted_tasks = sorted(self.heap)
-#         return [
-#             {"task_id": t[3], "priority": t[0], "execution_time": t[1]}
-#             for t in sorted_tasks
-#         ]
-#         # return self.heap
-#
-#     # def pop_next_task(self):
-#     #     """Pop the next highest-priority task efficiently (O(log n))."""
-#     #     if not self.heap:
-#     #         return None
-#     #     priority, exec_time, _, task_id = heapq.heappop(self.heap)
-#     #     return {"task_id": task_id, "priority": priority, "execution_time": exec_time}
-#
-#
-# if __name__ == '__main__':
-#     scheduler = TaskScheduler()
-#     scheduler.add_task(2, "A", 5)
-#     scheduler.add_task(1, "B", 10)
-#     scheduler.add_task(1, "C", 3)
-#     scheduler.add_task(1, "D", 3)
-#     scheduler.add_task(2, "E", 2)
-#
-#     print("All tasks (sorted view):")
-#     for t in scheduler.get_all_tasks():
-#         print(t)
-
-import heapq
-a=[]
-a.append(((2, 5,1,"A")))
-a.append(((1, 10,2,"B")))
-a.append(((1, 5,3,"A")))
-a.append(((1,3,4,"C")))
-a.append(((2,5,5,"C")))
-a.sort()
-print(a)
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Dict, List, Optional
 
+
+# -----------------------------
+# Task
+# -----------------------------
+class TaskState(Enum):
+    PENDING = 1
+    RUNNING = 2
+    DONE = 3
+    CANCELLED = 4
+
+
+class Task:
+    __slots__ = ('task_id', 'priority', 'execution_time', 'seq', 'func', 'args', 'kwargs',
+                 'state', 'future', 'heap_index', 'timer_slot', 'due', 'scheduler')
+
+    def __init__(self, priority: int, task_id, execution_time: float, seq: int,
+                 func: Optional[Callable] = None, args=(), kwargs=None):
+        self.task_id = task_id
+        self.priority = priority
+        self.execution_time = execution_time
+        self.seq = seq
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.state = TaskState.PENDING
+        self.future = None
+        self.heap_index = -1
+        self.timer_slot = None
+        self.due = False
+        self.scheduler = None
+
+    def sort_key(self):
+        return self.priority, self.execution_time, self.seq
+
+    def time_key(self):
+        return self.execution_time, self.seq
+
+    def cancel(self) -> bool:
+        if self.scheduler is None:
+            return False
+        return self.scheduler.cancel(self.task_id)
+
+    def to_dict(self) -> dict:
+        return {"task_id": self.task_id, "priority": self.priority, "execution_time": self.execution_time}
+
+    def __repr__(self):
+        return f"Task({self.task_id}, priority={self.priority}, execution_time={self.execution_time}, {self.state.name})"
+
+
+# -----------------------------
+# Indexed binary heap
+# -----------------------------
+class IndexedHeap:
+    # Min-heap of tasks ordered by key(task). Each task remembers its position
+    # (task.heap_index), so removing an arbitrary task is O(log n) as well.
+    def __init__(self, key: Callable):
+        self.key = key
+        self.items: List[Task] = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def peek(self) -> Optional[Task]:
+        return self.items[0] if self.items else None
+
+    def push(self, task: Task):
+        task.heap_index = len(self.items)
+        self.items.append(task)
+        self._sift_up(task.heap_index)
+
+    def pop(self) -> Optional[Task]:
+        if not self.items:
+            return None
+        return self.remove(self.items[0])
+
+    def remove(self, task: Task) -> Task:
+        i = task.heap_index
+        last = self.items.pop()
+        if last is not task:
+            self.items[i] = last
+            last.heap_index = i
+            self._sift_up(i)
+            self._sift_down(last.heap_index)
+        task.heap_index = -1
+        return task
+
+    def _sift_up(self, i):
+        items, key = self.items, self.key
+        task = items[i]
+        task_key = key(task)
+        while i > 0:
+            parent = (i - 1) >> 1
+            if key(items[parent]) <= task_key:
+                break
+            items[i] = items[parent]
+            items[i].heap_index = i
+            i = parent
+        items[i] = task
+        task.heap_index = i
+
+    def _sift_down(self, i):
+        items, key = self.items, self.key
+        n = len(items)
+        task = items[i]
+        task_key = key(task)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and key(items[child + 1]) < key(items[child]):
+                child += 1
+            if task_key <= key(items[child]):
+                break
+            items[i] = items[child]
+            items[i].heap_index = i
+            i = child
+        items[i] = task
+        task.heap_index = i
+
+
+# -----------------------------
+# Timer queue (tasks not yet due)
+# -----------------------------
+class HeapTimerQueue:
+    def __init__(self):
+        self.heap = IndexedHeap(Task.time_key)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def add(self, task: Task):
+        self.heap.push(task)
+
+    def remove(self, task: Task):
+        self.heap.remove(task)
+
+    def next_deadline(self) -> Optional[float]:
+        task = self.heap.peek()
+        return task.execution_time if task else None
+
+    def pop_due(self, now: float) -> List[Task]:
+        due = []
+        heap = self.heap
+        while heap.items and heap.items[0].execution_time <= now:
+            due.append(heap.pop())
+        return due
+
+    def tasks(self) -> List[Task]:
+        return list(self.heap.items)
+
+
+class HierarchicalTimingWheel:
+    # Hashed hierarchical timing wheel (Varghese & Lauck). Time is cut into
+    # ticks of `tick` seconds; level l has wheel_size slots each spanning
+    # wheel_size**l ticks. A task goes into the coarsest level its distance
+    # requires and is re-placed into finer levels ("cascaded") when the wheel
+    # reaches its slot, so add/remove are O(1) dict operations. Tasks fire at
+    # the first tick >= execution_time, i.e. up to one tick late, never early.
+    def __init__(self, tick: float = 0.001, wheel_size: int = 256, levels: int = 4, start: float = 0.0):
+        if wheel_size & (wheel_size - 1):
+            raise ValueError("wheel_size must be a power of two")
+        self.tick = tick
+        self.bits = wheel_size.bit_length() - 1
+        self.mask = wheel_size - 1
+        self.levels = levels
+        self.wheels = [[{} for _ in range(wheel_size)] for _ in range(levels)]
+        self.overdue: dict = {}
+        self.overflow: dict = {}
+        self.current_tick = math.floor(start / tick)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, task: Task):
+        self._place(task, math.ceil(task.execution_time / self.tick))
+        self.count += 1
+
+    def remove(self, task: Task):
+        del task.timer_slot[task]
+        task.timer_slot = None
+        self.count -= 1
+
+    def _place(self, task: Task, deadline: int):
+        delta = deadline - self.current_tick
+        if delta <= 0:
+            slot = self.overdue
+        else:
+            for level in range(self.levels):
+                if delta < 1 << (self.bits * (level + 1)):
+                    slot = self.wheels[level][(deadline >> (self.bits * level)) & self.mask]
+                    break
+            else:
+                slot = self.overflow
+        slot[task] = deadline
+        task.timer_slot = slot
+
+    def _cascade(self, slot: dict):
+        tasks = list(slot.items())
+        slot.clear()
+        for task, deadline in tasks:
+            self._place(task, deadline)
+
+    def _advance(self, target: int):
+        # Steps tick by tick only while level 0 holds tasks; otherwise jumps
+        # straight to the next tick that cascades something, so a long idle
+        # gap costs O(levels * wheel_size) rather than one iteration per tick.
+        if not self.count:
+            self.current_tick = max(self.current_tick, target)
+            return
+        bits, mask, wheels = self.bits, self.mask, self.wheels
+        check = True
+        while self.current_tick < target:
+            if check:
+                check = False
+                if not any(wheels[0]):
+                    nxt = self._next_cascade()
+                    if nxt is None or nxt > target:
+                        self.current_tick = target
+                        return
+                    self.current_tick = nxt - 1
+            self.current_tick += 1
+            t = self.current_tick
+            if not t & mask:
+                check = True
+                if not t & ((1 << (bits * self.levels)) - 1) and self.overflow:
+                    self._cascade(self.overflow)
+                for level in range(self.levels - 1, 0, -1):
+                    if not t & ((1 << (bits * level)) - 1):
+                        slot = wheels[level][(t >> (bits * level)) & mask]
+                        if slot:
+                            self._cascade(slot)
+            slot = wheels[0][t & mask]
+            if slot:
+                self.overdue.update(slot)
+                for task in slot:
+                    task.timer_slot = self.overdue
+                slot.clear()
+
+    def _next_cascade(self) -> Optional[int]:
+        # First tick after current_tick at which a non-empty slot above level 0
+        # (or the overflow list) is cascaded.
+        bits, mask, size = self.bits, self.mask, self.mask + 1
+        best = None
+        for level in range(1, self.levels):
+            shift = bits * level
+            q = self.current_tick >> shift
+            for i, slot in enumerate(self.wheels[level]):
+                if slot:
+                    t = (q + (((i - q) & mask) or size)) << shift
+                    if best is None or t < best:
+                        best = t
+        if self.overflow:
+            shift = bits * self.levels
+            t = ((self.current_tick >> shift) + 1) << shift
+            if best is None or t < best:
+                best = t
+        return best
+
+    def next_deadline(self) -> Optional[float]:
+        # Time of the next tick with work: a level-0 expiry or the next cascade.
+        # May be earlier than the true next expiry, never later.
+        if not self.count:
+            return None
+        if self.overdue:
+            return self.current_tick * self.tick
+        level0 = self.wheels[0]
+        for step in range(1, self.mask + 2):
+            t = self.current_tick + step
+            if level0[t & self.mask] or not t & self.mask:
+                return t * self.tick
+        return (self.current_tick + 1) * self.tick
+
+    def pop_due(self, now: float) -> List[Task]:
+        self._advance(math.floor(now / self.tick))
+        due = list(self.overdue)
+        for task in due:
+            task.timer_slot = None
+        self.count -= len(due)
+        self.overdue.clear()
+        return due
+
+    def tasks(self) -> List[Task]:
+        found = list(self.overdue) + list(self.overflow)
+        for wheel in self.wheels:
+            for slot in wheel:
+                found.extend(slot)
+        return found
+
+
+# -----------------------------
+# Scheduler
+# -----------------------------
+class TaskScheduler:
+    # Tasks wait in a timer queue until execution_time, then move to a ready heap
+    # ordered by (priority, execution_time, seq). start() launches a dispatcher
+    # thread that sleeps until the next deadline and submits ready tasks to a
+    # thread or process pool; without start() tasks can be drained with pop_next_task().
+    # timer="wheel" swaps the timer heap for a HierarchicalTimingWheel with the given
+    # tick, trading up to one tick of lateness for O(1) add/cancel.
+    def __init__(self, executor: str = "thread", max_workers: int = 4, clock: Callable[[], float] = time.time,
+                 timer: str = "heap", tick: float = 0.001):
+        if executor not in ("thread", "process"):
+            raise ValueError("executor must be 'thread' or 'process'")
+        if timer not in ("heap", "wheel"):
+            raise ValueError("timer must be 'heap' or 'wheel'")
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.clock = clock
+        if timer == "wheel":
+            self.waiting = HierarchicalTimingWheel(tick, start=clock())
+        else:
+            self.waiting = HeapTimerQueue()
+        self.ready = IndexedHeap(Task.sort_key)
+        self.tasks: Dict[object, Task] = {}
+        self.counter = itertools.count()  # to preserve insertion order
+        self.condition = threading.Condition()
+        self.executor = None
+        self.dispatcher = None
+        self.running = False
+        self._version = 0
+        self._snapshot = (-1, [])
+
+    # ---- queue operations ----
+    def add_task(self, priority_id: int, task_id, execution_time: float,
+                 func: Optional[Callable] = None, *args, **kwargs) -> Task:
+        with self.condition:
+            if task_id in self.tasks:
+                raise ValueError(f"Task {task_id} already scheduled")
+            task = Task(priority_id, task_id, execution_time, next(self.counter), func, args, kwargs)
+            task.scheduler = self
+            self.tasks[task_id] = task
+            if execution_time <= self.clock():
+                task.due = True
+                self.ready.push(task)
+            else:
+                self.waiting.add(task)
+            self._version += 1
+            self._on_enqueue(task)
+            self.condition.notify()
+            return task
+
+    def cancel(self, task_id) -> bool:
+        with self.condition:
+            task = self.tasks.pop(task_id, None)
+            if task is None:
+                return False
+            if task.due:
+                self.ready.remove(task)
+            else:
+                self.waiting.remove(task)
+            task.state = TaskState.CANCELLED
+            self._version += 1
+            self._on_dequeue(task)
+            self.condition.notify()
+            return True
+
+    def pop_next_task(self) -> Optional[Task]:
+        """Pop the highest-priority due task (O(log n)), or None if nothing is due."""
+        with self.condition:
+            self._promote(self.clock())
+            task = self.ready.pop()
+            if task is not None:
+                del self.tasks[task.task_id]
+                self._version += 1
+                self._on_dequeue(task)
+            return task
+
+    def get_all_tasks(self) -> List[dict]:
+        # Sorted snapshot, rebuilt only when the pending set has changed since the last call.
+        with self.condition:
+            version, snapshot = self._snapshot
+            if version != self._version:
+                pending = self.ready.items + self.waiting.tasks()
+                pending.sort(key=Task.sort_key)
+                snapshot = [task.to_dict() for task in pending]
+                self._snapshot = (self._version, snapshot)
+            return list(snapshot)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    # Called with the lock held whenever a task enters or leaves the pending set.
+    def _on_enqueue(self, task: Task):
+        pass
+
+    def _on_dequeue(self, task: Task):
+        pass
+
+    def _promote(self, now: float):
+        for task in self.waiting.pop_due(now):
+            task.due = True
+            self.ready.push(task)
+
+    # ---- dispatcher ----
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+            if self.executor_type == "process":
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self.dispatcher = threading.Thread(target=self._dispatch_loop, name="task-dispatcher", daemon=True)
+            self.dispatcher.start()
+
+    def shutdown(self, wait: bool = True):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.dispatcher:
+            self.dispatcher.join()
+            self.dispatcher = None
+        if self.executor:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
+
+    def _dispatch_loop(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    now = self.clock()
+                    self._promote(now)
+                    if self.ready:
+                        break
+                    deadline = self.waiting.next_deadline()
+                    self.condition.wait(None if deadline is None else max(0.0, deadline - now))
+                if not self.running:
+                    return
+                task = self.ready.pop()
+                del self.tasks[task.task_id]
+                self._version += 1
+                self._on_dequeue(task)
+            self._submit(task)
+
+    def _submit(self, task: Task):
+        task.state = TaskState.RUNNING
+        if task.func is None:
+            task.state = TaskState.DONE
+            return
+        task.future = self.executor.submit(task.func, *task.args, **task.kwargs)
+        task.future.add_done_callback(lambda _: setattr(task, 'state', TaskState.DONE))
+
+
+if __name__ == '__main__':
+    scheduler = TaskScheduler()
+    scheduler.add_task(2, "A", 5)
+    scheduler.add_task(1, "B", 10)
+    scheduler.add_task(1, "C", 3)
+    scheduler.add_task(1, "D", 3)
+    scheduler.add_task(2, "E", 2)
+    scheduler.cancel("D")
+
+    print("All tasks (sorted view):")
+    for t in scheduler.get_all_tasks():
+        print(t)
+    print(scheduler.pop_next_task())
+
+    # Timed execution on a worker pool
+    scheduler = TaskScheduler(max_workers=2)
+    scheduler.start()
+    now = time.time()
+    scheduler.add_task(1, "report", now + 0.2, print, "running report")
+    scheduler.add_task(0, "alert", now + 0.1, print, "running alert")
+    later = scheduler.add_task(0, "never", now + 5, print, "should not run")
+    later.cancel()
+    time.sleep(0.5)
+    scheduler.shutdown()
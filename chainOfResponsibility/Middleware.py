@@ -1,5 +1,9 @@
+import time
 from abc import ABC, abstractmethod
 
+from chainOfResponsibility.authCache import AuthCache
+from chainOfResponsibility.instrumentation import ChainMetrics
+
 
 class Middleware(ABC):
 
@@ -7,8 +11,21 @@ class Middleware(ABC):
     def handle_request(self, request):
         return request
 
+    def handle_batch(self, requests):
+        # One result per request, None for the ones this stage rejects.
+        # Override to share work across the batch.
+        return [self.handle_request(request) for request in requests]
+
 
 class AuthenticationMiddleware(Middleware):
+    # Without a verifier every request is accepted. With one, request["token"]
+    # is checked through an AuthCache and the principal stored in
+    # request["principal"]. A "principal" supplied by the client is always
+    # discarded; only the AuthCache sets it.
+    def __init__(self, verifier=None, auth_cache: AuthCache = None):
+        if auth_cache is None and verifier is not None:
+            auth_cache = AuthCache(verifier)
+        self.auth_cache = auth_cache
 
     def handle_request(self, request):
         if self.authenticate(request):
@@ -18,7 +35,39 @@ class AuthenticationMiddleware(Middleware):
             print("Authentication middleware: Authentication failed")
             return None
 
+    def handle_batch(self, requests):
+        # Every decision goes through authenticate(), so subclasses overriding
+        # it apply in batch mode too. With an AuthCache it runs once per
+        # distinct token and the principal it set is copied to the other
+        # requests carrying that token; without one it runs per request.
+        decisions = {}
+        results = []
+        for request in requests:
+            token = request.get("token")
+            if self.auth_cache is None or token not in decisions:
+                allowed = self.authenticate(request)
+                principal = request.get("principal") if allowed else None
+                if self.auth_cache is not None:
+                    decisions[token] = (allowed, principal)
+            else:
+                allowed, principal = decisions[token]
+                request.pop("principal", None)
+                if principal is not None:
+                    request["principal"] = principal
+            results.append(request if allowed else None)
+        failed = results.count(None)
+        shared = f" ({len(decisions)} distinct tokens)" if self.auth_cache is not None else ""
+        print(f"Authentication middleware: {len(results) - failed} authenticated, {failed} failed{shared}")
+        return results
+
     def authenticate(self, request):
+        request.pop("principal", None)
+        if self.auth_cache is None:
+            return True
+        principal = self.auth_cache.authenticate(request.get("token"))
+        if principal is None:
+            return False
+        request["principal"] = principal
         return True
 
 
@@ -28,6 +77,10 @@ class LoggingMiddleware(Middleware):
         print("Logging middleware: Logging request")
         return super().handle_request(request)
 
+    def handle_batch(self, requests):
+        print(f"Logging middleware: Logging {len(requests)} requests")
+        return list(requests)
+
 
 class DataValidationMiddleware(Middleware):
 
@@ -39,6 +92,12 @@ class DataValidationMiddleware(Middleware):
             print("Data Validation middleware: Invalid data")
             return None
 
+    def handle_batch(self, requests):
+        results = [request if self.validate_data(request) else None for request in requests]
+        failed = results.count(None)
+        print(f"Data Validation middleware: {len(results) - failed} valid, {failed} invalid")
+        return results
+
     def validate_data(self, request):
         return True
 
@@ -47,6 +106,7 @@ class DataValidationMiddleware(Middleware):
 class Chain:
     def __init__(self):
         self.middlewares = []
+        self.metrics = None
 
     def add_middleware(self, middleware):
         self.middlewares.append(middleware)
@@ -58,6 +118,49 @@ class Chain:
                 print("Request processing stopped.")
                 break
 
+    def handle_batch(self, requests):
+        # Each middleware sees the whole surviving batch; rejected requests drop
+        # out before the next stage. Returns results in input order, None for
+        # rejected requests.
+        results = [None] * len(requests)
+        positions = list(range(len(requests)))
+        batch = list(requests)
+        for middleware in self.middlewares:
+            if not batch:
+                break
+            outputs = middleware.handle_batch(batch)
+            survivors = [(i, out) for i, out in zip(positions, outputs) if out is not None]
+            positions = [i for i, _ in survivors]
+            batch = [out for _, out in survivors]
+        for i, request in zip(positions, batch):
+            results[i] = request
+        rejected = len(requests) - len(batch)
+        if rejected:
+            print(f"Request processing stopped for {rejected} of {len(requests)} requests.")
+        return results
+
+    def instrument(self, metrics: ChainMetrics = None) -> ChainMetrics:
+        # Opt-in per-stage timing. The instrumented loop is swapped in as an
+        # instance attribute, so an uninstrumented Chain runs the plain loop.
+        self.metrics = metrics or ChainMetrics()
+        self.handle_request = self._handle_request_instrumented
+        return self.metrics
+
+    def uninstrument(self):
+        self.__dict__.pop("handle_request", None)
+        self.metrics = None
+
+    def _handle_request_instrumented(self, request):
+        record = self.metrics.record
+        clock = time.perf_counter_ns
+        for middleware in self.middlewares:
+            start = clock()
+            request = middleware.handle_request(request)
+            record(type(middleware).__name__, clock() - start, request is None)
+            if request is None:
+                print("Request processing stopped.")
+                break
+
 if __name__ == "__main__":
     # Create middleware instances.
     auth_middleware = AuthenticationMiddleware()
@@ -72,4 +175,12 @@ if __name__ == "__main__":
 
     # Simulate an HTTP request.
     http_request = {"user": "username", "data": "valid_data"}
-    chain.handle_request(http_request)
\ No newline at end of file
+    chain.handle_request(http_request)
+
+    # Batch mode: rejected requests drop out between stages.
+    print(chain.handle_batch([http_request, {"user": "other", "token": "t1"}, http_request]))
+
+    # Per-stage latency, opt-in.
+    metrics = chain.instrument()
+    chain.handle_request(http_request)
+    print(metrics.snapshot())
\ No newline at end of file
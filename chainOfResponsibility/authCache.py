@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Optional
+
+from LRUCache.lru import LRUCache
+
+AuthCacheInfo = namedtuple("AuthCacheInfo", ["hits", "negative_hits", "misses", "coalesced", "revoked", "currsize"])
+
+_REJECTED = object()  # cached "this token does not authenticate"
+
+
+class _PendingCheck:
+    # Verification in flight for one token; followers wait on it.
+    def __init__(self):
+        self.event = threading.Event()
+        self.principal = None
+        self.error = None
+        self.revoked = False
+
+    def wait(self):
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.principal
+
+
+class AuthCache:
+    # Bounded TTL cache of token -> principal in front of a pluggable verifier
+    # (a callable returning the principal, or None for an invalid token).
+    # Rejections are cached too, for negative_ttl seconds. Concurrent checks of
+    # an uncached token run the verifier once; the other callers share the
+    # result. revoke() makes a token fail for `ttl` seconds, including for a
+    # verification already in flight. Revocations live outside the LRU, so
+    # cache pressure can never evict one early. Verifier errors are raised,
+    # not cached.
+    def __init__(self, verifier: Callable[[str], object], capacity: int = 10_000, ttl: float = 300.0,
+                 negative_ttl: float = 30.0, clock=time.monotonic):
+        self.verifier = verifier
+        self.capacity = capacity
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.cache = LRUCache(capacity, ttl=ttl, clock=clock)
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.revocations = {}  # token -> time the revocation lapses
+        self._purge_at = 64
+        self.hits = self.negative_hits = self.misses = self.coalesced = self.revoked = 0
+
+    def authenticate(self, token) -> Optional[object]:
+        if token is None:
+            return None
+        with self.lock:
+            if self._is_revoked(token):
+                self.negative_hits += 1
+                return None
+            if token in self.cache:
+                principal = self.cache.get(token)
+                if principal is _REJECTED:
+                    self.negative_hits += 1
+                    return None
+                self.hits += 1
+                return principal
+            check = self.pending.get(token)
+            if check is None:
+                check = self.pending[token] = _PendingCheck()
+                self.misses += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            return check.wait()
+
+        try:
+            principal = self.verifier(token)
+        except BaseException as error:
+            check.error = error
+            raise
+        else:
+            with self.lock:
+                if check.revoked or self._is_revoked(token):
+                    principal = None
+                elif principal is None:
+                    self.cache.put(token, _REJECTED, ttl=self.negative_ttl)
+                else:
+                    self.cache.put(token, principal)
+            check.principal = principal
+            return principal
+        finally:
+            with self.lock:
+                self.pending.pop(token, None)
+            check.event.set()
+
+    def revoke(self, token):
+        with self.lock:
+            self.revoked += 1
+            self.revocations[token] = self.clock() + self.ttl
+            if token in self.cache:
+                self.cache.remove(token)
+            check = self.pending.get(token)
+            if check is not None:
+                check.revoked = True
+            if len(self.revocations) >= self._purge_at:
+                now = self.clock()
+                self.revocations = {t: until for t, until in self.revocations.items() if until > now}
+                self._purge_at = max(64, 2 * len(self.revocations))
+
+    def _is_revoked(self, token) -> bool:
+        # Caller holds the lock.
+        until = self.revocations.get(token)
+        if until is None:
+            return False
+        if until > self.clock():
+            return True
+        del self.revocations[token]
+        return False
+
+    def invalidate(self, token):
+        # Forget a cached result so the next check asks the verifier again.
+        with self.lock:
+            if token in self.cache:
+                self.cache.remove(token)
+
+    def cache_info(self) -> AuthCacheInfo:
+        with self.lock:
+            return AuthCacheInfo(self.hits, self.negative_hits, self.misses, self.coalesced, self.revoked,
+                                 len(self.cache))
+
+
+if __name__ == "__main__":
+    def slow_verifier(token):
+        print(f"verifying {token}")
+        time.sleep(0.1)
+        return {"user": "alice"} if token == "abc123" else None
+
+    auth = AuthCache(slow_verifier, ttl=60, negative_ttl=5)
+    threads = [threading.Thread(target=auth.authenticate, args=("abc123",)) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(auth.authenticate("abc123"))
+    print(auth.authenticate("forged"), auth.authenticate("forged"))
+    auth.revoke("abc123")
+    print(auth.authenticate("abc123"))
+    print(auth.cache_info())
@@ -0,0 +1,46 @@
+import time
+
+from chainOfResponsibility.Middleware import Chain, Middleware
+from chainOfResponsibility.pipeline import Pipeline
+
+
+class PassThroughMiddleware(Middleware):
+    # Middleware without the demo's print() calls, so only dispatch cost is measured.
+    def handle_request(self, request):
+        return super().handle_request(request)
+
+
+def pass_through(request):
+    return request
+
+
+def _rate(handle, request, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        handle(request)
+    return n / (time.perf_counter() - start)
+
+
+def bench_pipeline(stages=10, n=200_000):
+    request = {"user": "username", "data": "valid_data"}
+
+    chain = Chain()
+    for _ in range(stages):
+        chain.add_middleware(PassThroughMiddleware())
+
+    middleware_pipeline = Pipeline()
+    function_pipeline = Pipeline()
+    for _ in range(stages):
+        middleware_pipeline.use(PassThroughMiddleware())
+        function_pipeline.use(pass_through)
+
+    print(f"{stages}-stage chain, {n} requests")
+    print(f"{'implementation':>28} {'requests/sec':>14}")
+    for name, handle in (("Chain", chain.handle_request),
+                         ("Pipeline (Middleware)", middleware_pipeline.compile()),
+                         ("Pipeline (functions)", function_pipeline.compile())):
+        print(f"{name:>28} {_rate(handle, request, n):>14,.0f}")
+
+
+if __name__ == "__main__":
+    bench_pipeline()
@@ -0,0 +1,134 @@
+import threading
+from typing import Dict
+
+
+# -----------------------------
+# Latency histogram
+# -----------------------------
+class LatencyHistogram:
+    # HDR-style log-linear histogram of nanosecond latencies in fixed memory:
+    # every power-of-two range is split into 2**precision_bits equal buckets,
+    # so any recorded value is reported within 1 / 2**precision_bits of itself.
+    # Values above max_value are clamped into the last bucket.
+    def __init__(self, precision_bits: int = 7, max_value: int = 1 << 40):
+        self.precision_bits = precision_bits
+        self.sub_buckets = 1 << precision_bits
+        self.max_value = max_value
+        self.counts = [0] * (self._index(max_value) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_buckets:
+            return value
+        shift = value.bit_length() - self.precision_bits - 1
+        return (shift + 1) * self.sub_buckets + (value >> shift) - self.sub_buckets
+
+    def _lowest(self, index: int) -> int:
+        # Smallest value that lands in bucket `index`.
+        if index < self.sub_buckets:
+            return index
+        shift, offset = divmod(index, self.sub_buckets)
+        shift -= 1
+        return (self.sub_buckets + offset) << shift
+
+    def _highest(self, index: int) -> int:
+        return self._lowest(index + 1) - 1
+
+    def record(self, value: int):
+        if value < 0:
+            value = 0
+        elif value > self.max_value:
+            value = self.max_value
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        # Upper edge of the bucket holding the q-th percentile (0 < q <= 100).
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return min(self._highest(index), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+# -----------------------------
+# Per-stage metrics
+# -----------------------------
+class StageMetrics:
+    def __init__(self, name: str, precision_bits: int = 7):
+        self.name = name
+        self.calls = 0
+        self.rejections = 0
+        self.latency = LatencyHistogram(precision_bits)
+
+    def record(self, elapsed_ns: int, rejected: bool):
+        self.calls += 1
+        if rejected:
+            self.rejections += 1
+        self.latency.record(elapsed_ns)
+
+
+class ChainMetrics:
+    # Stage name -> StageMetrics for one chain, shared by the threads using it.
+    QUANTILES = (50, 90, 99, 99.9)
+
+    def __init__(self, precision_bits: int = 7):
+        self.precision_bits = precision_bits
+        self.stages: Dict[str, StageMetrics] = {}
+        self.lock = threading.Lock()
+
+    def record(self, stage: str, elapsed_ns: int, rejected: bool = False):
+        with self.lock:
+            metrics = self.stages.get(stage)
+            if metrics is None:
+                metrics = self.stages[stage] = StageMetrics(stage, self.precision_bits)
+            metrics.record(elapsed_ns, rejected)
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {name: {
+                "calls": m.calls,
+                "rejections": m.rejections,
+                "mean_ns": m.latency.mean(),
+                "min_ns": m.latency.min or 0,
+                "max_ns": m.latency.max,
+                **{f"p{q:g}_ns": m.latency.percentile(q) for q in self.QUANTILES},
+            } for name, m in self.stages.items()}
+
+    def prometheus(self, prefix: str = "chain_stage") -> str:
+        # Text exposition format: a latency summary (seconds) plus call and
+        # rejection counters, labelled by stage. Each metric family is written
+        # as one contiguous block after its own TYPE line.
+        latency = [f"# TYPE {prefix}_latency_seconds summary"]
+        calls = [f"# TYPE {prefix}_calls_total counter"]
+        rejections = [f"# TYPE {prefix}_rejections_total counter"]
+        with self.lock:
+            for name, m in self.stages.items():
+                label = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                for q in self.QUANTILES:
+                    latency.append(f'{prefix}_latency_seconds{{stage="{label}",quantile="{q / 100:g}"}} '
+                                   f'{m.latency.percentile(q) / 1e9:.9f}')
+                latency.append(f'{prefix}_latency_seconds_sum{{stage="{label}"}} {m.latency.total / 1e9:.9f}')
+                latency.append(f'{prefix}_latency_seconds_count{{stage="{label}"}} {m.latency.count}')
+                calls.append(f'{prefix}_calls_total{{stage="{label}"}} {m.calls}')
+                rejections.append(f'{prefix}_rejections_total{{stage="{label}"}} {m.rejections}')
+        return "\n".join(latency + calls + rejections) + "\n"
@@ -1,7 +1,15 @@
+import threading
+import time
+
+from chainOfResponsibility.authCache import AuthCache
+from chainOfResponsibility.instrumentation import ChainMetrics
+
+
 class Request:
     def __init__(self, data):
         self.data = data
         self.valid = True
+        self.principal = None
 
 
 class RequestHandler:
@@ -12,12 +20,72 @@ class RequestHandler:
         if self.successor:
             self.successor.handle_request(request)
 
+    def instrument(self, metrics: ChainMetrics = None) -> ChainMetrics:
+        # Opt-in per-stage timing for this handler and all its successors. Each
+        # handler gets an instance-level wrapper, so uninstrumented chains keep
+        # calling the plain methods. Latency is exclusive of the successors;
+        # a rejection is a stage that turned request.valid from True to False.
+        metrics = metrics or ChainMetrics()
+        local = threading.local()
+        handler = self
+        while handler:
+            handler.__dict__.pop("handle_request", None)
+            handler.handle_request = _instrumented(handler, type(handler).handle_request, metrics, local)
+            handler = handler.successor
+        return metrics
+
+    def uninstrument(self):
+        handler = self
+        while handler:
+            handler.__dict__.pop("handle_request", None)
+            handler = handler.successor
+
+
+_NOT_HANDED_OFF = object()
+
+
+def _instrumented(handler, handle, metrics: ChainMetrics, local):
+    name = type(handler).__name__
+    clock = time.perf_counter_ns
+
+    def handle_request(request):
+        # local.nested: time spent in successors; local.handoff: request.valid
+        # as it was when the next instrumented stage was entered.
+        outer = getattr(local, "nested", 0)
+        valid = request.valid
+        local.nested = 0
+        local.handoff = _NOT_HANDED_OFF
+        start = clock()
+        try:
+            handle(handler, request)
+        finally:
+            elapsed = clock() - start
+            handed_off = local.handoff
+            valid_after = request.valid if handed_off is _NOT_HANDED_OFF else handed_off
+            metrics.record(name, elapsed - local.nested, valid and not valid_after)
+            local.nested = outer + elapsed
+            local.handoff = valid
+    return handle_request
+
 
 class AuthenticationHandler(RequestHandler):
+    # With a verifier (or a shared AuthCache) the token must also verify; the
+    # result is cached and the principal stored on the request.
+    def __init__(self, successor=None, verifier=None, auth_cache: AuthCache = None):
+        super().__init__(successor)
+        if auth_cache is None and verifier is not None:
+            auth_cache = AuthCache(verifier)
+        self.auth_cache = auth_cache
+
     def handle_request(self, request):
         if "token" not in request.data:
             request.valid = False
             print("Authentication failed")
+        elif self.auth_cache is not None:
+            request.principal = self.auth_cache.authenticate(request.data["token"])
+            if request.principal is None:
+                request.valid = False
+                print("Authentication failed")
         super().handle_request(request)
 
 
@@ -50,4 +118,9 @@ if __name__ == "__main__":
     if request.valid:
         print("Request processing successful")
     else:
-        print("Request processing failed")
\ No newline at end of file
+        print("Request processing failed")
+
+    # Per-stage latency, opt-in.
+    metrics = logging_handler.instrument()
+    logging_handler.handle_request(Request({"data": "some_data"}))
+    print(metrics.prometheus())
\ No newline at end of file
@@ -0,0 +1,129 @@
+import asyncio
+import inspect
+from typing import Callable
+
+from chainOfResponsibility.Middleware import (AuthenticationMiddleware, DataValidationMiddleware, LoggingMiddleware,
+                                              Middleware)
+
+
+# -----------------------------
+# Typed short-circuit result
+# -----------------------------
+class Rejected:
+    # Returned by a stage (and by the compiled pipeline) to stop processing.
+    __slots__ = ('stage', 'reason', 'request')
+
+    def __init__(self, stage: str, reason: str = "", request=None):
+        self.stage = stage
+        self.reason = reason
+        self.request = request
+
+    def __repr__(self):
+        return f"Rejected(stage={self.stage!r}, reason={self.reason!r})"
+
+
+def _is_async(fn) -> bool:
+    return inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(getattr(fn, "__call__", None))
+
+
+# -----------------------------
+# Pipeline builder
+# -----------------------------
+class Pipeline:
+    # Stages are Middleware instances or callables taking a request and returning
+    # the (possibly new) request or a Rejected. compile() links the stages into
+    # nested closures once, so a request runs with no list iteration and no
+    # per-request dispatch on stage kind or sync/async. A Middleware may return
+    # a Rejected too; None is reported as Rejected(<its class name>).
+    def __init__(self):
+        self.stages = []
+
+    def use(self, stage, name: str = None) -> 'Pipeline':
+        if name is None:
+            name = type(stage).__name__ if isinstance(stage, Middleware) else getattr(stage, "__name__", repr(stage))
+        self.stages.append((name, stage))
+        return self
+
+    def _handlers(self):
+        for name, stage in self.stages:
+            if isinstance(stage, Middleware):
+                yield name, stage.handle_request, True
+            else:
+                yield name, stage, False
+
+    def compile(self) -> Callable:
+        handlers = list(self._handlers())
+        for name, handler, _ in handlers:
+            if _is_async(handler):
+                raise ValueError(f"Stage {name} is async; use compile_async()")
+        rest = None
+        for name, handler, middleware in reversed(handlers):
+            rest = _link(name, handler, middleware, rest)
+        return rest or (lambda request: request)
+
+    def compile_async(self) -> Callable:
+        # Sync and async stages can be mixed; which stages are awaited is
+        # decided here, not per request.
+        rest = None
+        for name, handler, middleware in reversed(list(self._handlers())):
+            rest = _link_async(name, handler, middleware, _is_async(handler), rest)
+        if rest is None:
+            async def rest(request):
+                return request
+        return rest
+
+
+def _link(name, handler, middleware, rest):
+    if middleware:
+        def step(request):
+            result = handler(request)
+            if result is None:
+                return Rejected(name, "middleware returned None", request)
+            if result.__class__ is Rejected or rest is None:
+                return result
+            return rest(result)
+    elif rest is None:
+        step = handler
+    else:
+        def step(request):
+            result = handler(request)
+            if result.__class__ is Rejected:
+                return result
+            return rest(result)
+    return step
+
+
+def _link_async(name, handler, middleware, awaited, rest):
+    async def step(request):
+        result = handler(request)
+        if awaited:
+            result = await result
+        if middleware and result is None:
+            return Rejected(name, "middleware returned None", request)
+        if result.__class__ is Rejected or rest is None:
+            return result
+        return await rest(result)
+    return step
+
+
+if __name__ == "__main__":
+    def require_user(request):
+        if "user" not in request:
+            return Rejected("require_user", "missing user", request)
+        return request
+
+    async def enrich(request):
+        await asyncio.sleep(0)
+        return {**request, "enriched": True}
+
+    pipeline = (Pipeline()
+                .use(AuthenticationMiddleware())
+                .use(LoggingMiddleware())
+                .use(require_user)
+                .use(DataValidationMiddleware()))
+    handle = pipeline.compile()
+    print(handle({"user": "username", "data": "valid_data"}))
+    print(handle({"data": "valid_data"}))
+
+    handle_async = pipeline.use(enrich).compile_async()
+    print(asyncio.run(handle_async({"user": "username", "data": "valid_data"})))
@@ -1,6 +1,7 @@
-import time
 from abc import ABC, abstractmethod
 
+from LRUCache.memoize import lru_memoize
+
 
 # Define the interface for the Real Subject
 class DatabaseQuery(ABC):
@@ -18,19 +19,16 @@ class RealDatabaseQuery(DatabaseQuery):
 
 
 # Proxy: Caching Proxy for Database Queries
+# Backed by a bounded, expiring LRU; concurrent misses on the same query hit the database once.
 class CacheProxy(DatabaseQuery):
-    def __init__(self, real_database_query, cache_duration_seconds):
+    def __init__(self, real_database_query, cache_duration_seconds, capacity=1024):
         self._real_database_query = real_database_query
-        self._cache = {}
         self._cache_duration = cache_duration_seconds
+        self._cached_query = lru_memoize(capacity=capacity, ttl=cache_duration_seconds)(
+            real_database_query.execute_query)
 
     def execute_query(self, query):
-        if query in self._cache and time.time() - self._cache[query]["timestamp"] <= self._cache_duration:
-            # Return cached result if it's still valid
-            print(f"CacheProxy: Returning cached result for query: {query}")
-            return self._cache[query]["result"]
-        else:
-            # Execute the query and cache the result
-            result = self._real_database_query.execute_query(query)
-            self._cache[query] = {"result": result, "timestamp": time.time()}
-            return result
+        return self._cached_query(query)
+
+    def cache_info(self):
+        return self._cached_query.cache_info()